@@ -4,49 +4,46 @@
 # This script is retained for reference but is no longer actively maintained.
 """Generate morning digest from Obsidian vault, send to Slack DM."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-import yaml
+from datetime import date, datetime, timedelta
+
+# Shared note frontmatter reader
+from frontmatter import load_frontmatter
 
 # Use shared Slack client with retry logic
 from slack_client import send_dm
 
 VAULT_PATH = Path.home() / "SecondBrain"
 
+# Concurrent note reads when scanning the vault
+READ_WORKERS = 8
+
+
+def _read_frontmatter(path):
+    """Parse a note's YAML frontmatter; None if missing, invalid or unreadable."""
+    try:
+        return load_frontmatter(path)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+    return None
+
 
 def gather_active_items():
     """Collect active projects and people with follow-ups."""
-    projects = []
-    people = []
-    
     projects_dir = VAULT_PATH / "projects"
-    if projects_dir.exists():
-        for f in projects_dir.glob("*.md"):
-            try:
-                content = f.read_text()
-                if "---" in content:
-                    parts = content.split("---")
-                    if len(parts) >= 2:
-                        fm = yaml.safe_load(parts[1])
-                        if fm and fm.get("status") == "active":
-                            projects.append(fm)
-            except Exception as e:
-                print(f"Error reading {f}: {e}")
-    
     people_dir = VAULT_PATH / "people"
-    if people_dir.exists():
-        for f in people_dir.glob("*.md"):
-            try:
-                content = f.read_text()
-                if "---" in content:
-                    parts = content.split("---")
-                    if len(parts) >= 2:
-                        fm = yaml.safe_load(parts[1])
-                        if fm and fm.get("follow_ups"):
-                            people.append(fm)
-            except Exception as e:
-                print(f"Error reading {f}: {e}")
-    
+    project_paths = list(projects_dir.glob("*.md")) if projects_dir.exists() else []
+    people_paths = list(people_dir.glob("*.md")) if people_dir.exists() else []
+
+    # Note reads are independent and I/O bound; overlap them
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        project_fms = executor.map(_read_frontmatter, project_paths)
+        people_fms = executor.map(_read_frontmatter, people_paths)
+
+        projects = [fm for fm in project_fms if fm and fm.get("status") == "active"]
+        people = [fm for fm in people_fms if fm and fm.get("follow_ups")]
+
     return projects, people
 
 
@@ -59,11 +56,17 @@ def find_stalled_items(projects):
         created = proj.get("created", "")
         if created:
             try:
-                created_date = datetime.strptime(created, "%Y-%m-%d")
+                # YAML already turns unquoted YYYY-MM-DD into a date
+                if isinstance(created, datetime):
+                    created_date = created.date()
+                elif isinstance(created, date):
+                    created_date = created
+                else:
+                    created_date = date.fromisoformat(created)
                 if oldest_date is None or created_date < oldest_date:
                     oldest_date = created_date
                     stalled = proj
-            except ValueError:
+            except (TypeError, ValueError):
                 continue
     
     return stalled
@@ -9,7 +9,7 @@ Classifies messages into domains: Personal, Just-Value, CCBH.
 import json
 import logging
 import re
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Optional, List
 
 from ollama_client import (
@@ -21,6 +21,12 @@ from ollama_client import (
 )
 from vault_scanner import VaultScanner
 
+# Optional: pyahocorasick scans a response for all domains in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Configure module logger
 logger = logging.getLogger(__name__)
 
@@ -49,6 +55,22 @@ IMPORTANT:
 - If unsure, use a lower confidence value
 - Respond ONLY with valid JSON"""
 
+# Prompt template for classifying several messages in one LLM call
+BATCH_CLASSIFICATION_PROMPT = """You are a message classification assistant. Classify EACH of the following messages into ONE of these domains:
+{domains}
+
+Messages:
+{messages}
+
+Respond with a JSON array of exactly {count} objects, one per message in the same order, with no additional text:
+[{{"domain": "<domain>", "confidence": <0.0-1.0>, "reasoning": "<brief explanation>"}}, ...]
+
+IMPORTANT:
+- Only use domains from the list above
+- confidence should be between 0.0 and 1.0
+- If unsure, use a lower confidence value
+- Respond ONLY with valid JSON"""
+
 
 class DomainClassifier:
     """
@@ -68,6 +90,9 @@ class DomainClassifier:
         self.ollama = ollama_client
         self.scanner = vault_scanner
         self._vocabulary = None
+        self._valid_domains = None
+        self._domain_lookup_cache = None
+        self._domain_automaton = None
     
     @property
     def vocabulary(self) -> dict:
@@ -78,8 +103,20 @@ class DomainClassifier:
     
     @property
     def valid_domains(self) -> List[str]:
-        """Get list of valid domain names."""
-        return self.vocabulary.get("domains", [])
+        """Get list of valid domain names (read from the vocabulary once)."""
+        if self._valid_domains is None:
+            self._valid_domains = self.vocabulary.get("domains", [])
+        return self._valid_domains
+    
+    @property
+    def _domain_lookup(self) -> dict:
+        """Map lowercased domain names to their canonical form (built once)."""
+        if self._domain_lookup_cache is None:
+            lookup = {}
+            for valid_domain in self.valid_domains:
+                lookup.setdefault(valid_domain.lower(), valid_domain)
+            self._domain_lookup_cache = lookup
+        return self._domain_lookup_cache
     
     def _build_prompt(self, message: str, domains: List[str]) -> str:
         """Build classification prompt with vocabulary."""
@@ -95,13 +132,7 @@ class DomainClassifier:
         
         Returns None if domain doesn't match any valid domain.
         """
-        domain_lower = domain.lower().strip()
-        
-        for valid_domain in self.valid_domains:
-            if valid_domain.lower() == domain_lower:
-                return valid_domain
-        
-        return None
+        return self._domain_lookup.get(domain.lower().strip())
     
     def _parse_response(self, response: str, valid_domains: List[str]) -> ClassificationResult:
         """
@@ -112,26 +143,7 @@ class DomainClassifier:
         try:
             # Try JSON parse first
             data = json.loads(response)
-            
-            raw_domain = data.get("domain", "unknown")
-            raw_confidence = data.get("confidence", 0.5)
-            reasoning = data.get("reasoning", "")
-            
-            # Normalize domain
-            normalized_domain = self._normalize_domain(raw_domain)
-            if normalized_domain is None:
-                normalized_domain = "unknown"
-                reasoning = f"Invalid domain '{raw_domain}' - not in vocabulary"
-            
-            # Clamp confidence
-            confidence = max(0.0, min(1.0, float(raw_confidence)))
-            
-            return ClassificationResult(
-                domain=normalized_domain,
-                confidence=confidence,
-                reasoning=reasoning,
-                raw_response=response
-            )
+            return self._result_from_data(data, response)
             
         except (json.JSONDecodeError, ValueError, TypeError) as e:
             logger.warning(f"Failed to parse LLM response as JSON: {e}")
@@ -146,12 +158,67 @@ class DomainClassifier:
                 raw_response=response
             )
     
+    def _result_from_data(self, data: dict, raw_response: str) -> ClassificationResult:
+        """
+        Build a ClassificationResult from one parsed JSON object.
+        
+        Raises ValueError/TypeError on unusable confidence values.
+        """
+        raw_domain = data.get("domain", "unknown")
+        raw_confidence = data.get("confidence", 0.5)
+        reasoning = data.get("reasoning", "")
+        
+        # Normalize domain
+        normalized_domain = self._normalize_domain(raw_domain)
+        if normalized_domain is None:
+            normalized_domain = "unknown"
+            reasoning = f"Invalid domain '{raw_domain}' - not in vocabulary"
+        
+        # Clamp confidence
+        confidence = max(0.0, min(1.0, float(raw_confidence)))
+        
+        return ClassificationResult(
+            domain=normalized_domain,
+            confidence=confidence,
+            reasoning=reasoning,
+            raw_response=raw_response
+        )
+    
+    def _error_result(self, error: OllamaError) -> ClassificationResult:
+        """Map an Ollama failure to an 'unknown' result."""
+        if isinstance(error, OllamaServerNotRunning):
+            logger.error(f"Ollama server not running: {error}")
+            reasoning = "Error: Ollama server not running"
+        elif isinstance(error, OllamaTimeout):
+            logger.error(f"Ollama timeout: {error}")
+            reasoning = "Error: Ollama request timed out"
+        else:
+            logger.error(f"Ollama error: {error}")
+            reasoning = f"Error: {str(error)}"
+        
+        return ClassificationResult(
+            domain="unknown",
+            confidence=0.0,
+            reasoning=reasoning
+        )
+    
     def _extract_domain_fallback(self, response: str) -> Optional[str]:
         """Try to extract domain from malformed response using regex."""
         response_lower = response.lower()
         
-        for domain in self.valid_domains:
-            if domain.lower() in response_lower:
+        if ahocorasick is not None and self._domain_lookup:
+            if self._domain_automaton is None:
+                automaton = ahocorasick.Automaton()
+                for index, (domain_lower, domain) in enumerate(self._domain_lookup.items()):
+                    automaton.add_word(domain_lower, (index, domain))
+                automaton.make_automaton()
+                self._domain_automaton = automaton
+            # Earliest vocabulary entry wins, matching the plain scan below
+            matches = [value for _, value in self._domain_automaton.iter(response_lower)]
+            return min(matches)[1] if matches else None
+        
+        for domain_lower, domain in self._domain_lookup.items():
+            if domain_lower in response_lower:
                 return domain
         
         return None
@@ -197,29 +264,61 @@ class DomainClassifier:
             # Parse response
             return self._parse_response(content, domains)
             
-        except OllamaServerNotRunning as e:
-            logger.error(f"Ollama server not running: {e}")
-            return ClassificationResult(
-                domain="unknown",
-                confidence=0.0,
-                reasoning="Error: Ollama server not running"
-            )
-            
-        except OllamaTimeout as e:
-            logger.error(f"Ollama timeout: {e}")
-            return ClassificationResult(
-                domain="unknown",
-                confidence=0.0,
-                reasoning="Error: Ollama request timed out"
-            )
+        except OllamaError as e:
+            return self._error_result(e)
+    
+    def classify_batch(self, messages: List[str]) -> List[ClassificationResult]:
+        """
+        Classify several messages with a single LLM call.
+        
+        Falls back to per-message classify() if the model's reply can't be
+        matched one-to-one with the messages.
+        
+        Args:
+            messages: Message texts to classify
             
+        Returns:
+            One ClassificationResult per message, in input order
+        """
+        # Empty messages (and single-message batches) need no shared call
+        domains = self.valid_domains
+        pending = [i for i, m in enumerate(messages) if m and m.strip()]
+        if len(pending) < 2 or not domains:
+            return [self.classify(m) for m in messages]
+        
+        numbered = "\n".join(
+            f"{n}. {messages[i]}" for n, i in enumerate(pending, 1)
+        )
+        prompt = BATCH_CLASSIFICATION_PROMPT.format(
+            domains=", ".join(domains),
+            messages=numbered,
+            count=len(pending)
+        )
+        
+        try:
+            response = self.ollama.chat([{"role": "user", "content": prompt}])
         except OllamaError as e:
-            logger.error(f"Ollama error: {e}")
-            return ClassificationResult(
-                domain="unknown",
-                confidence=0.0,
-                reasoning=f"Error: {str(e)}"
-            )
+            error_result = self._error_result(e)
+            batch_results = [replace(error_result) for _ in pending]
+        else:
+            content = response.get("message", {}).get("content", "")
+            try:
+                data = json.loads(content)
+                if not isinstance(data, list) or len(data) != len(pending):
+                    raise ValueError(f"expected {len(pending)} results")
+                batch_results = [
+                    self._result_from_data(item, json.dumps(item)) for item in data
+                ]
+            except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Batch response unusable, classifying individually: {e}")
+                return [self.classify(m) for m in messages]
+        
+        # Empty messages get classify()'s own result; no LLM call is made
+        results = dict(zip(pending, batch_results))
+        return [
+            results[i] if i in results else self.classify(m)
+            for i, m in enumerate(messages)
+        ]
 
 
 # Convenience function
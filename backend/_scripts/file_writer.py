@@ -9,6 +9,7 @@ Uses pathlib for all path operations and manual YAML generation
 (no external dependencies).
 """
 
+import os
 import re
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,21 @@ from typing import TYPE_CHECKING, List, Optional, Tuple
 if TYPE_CHECKING:
     from message_classifier import ClassificationResult
 
+# Compiled once; sanitize_filename runs for every note and attachment
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_HYPHEN_RUN_RE = re.compile(r'-+')
+
+# Note folders already created/confirmed this process
+_KNOWN_FOLDERS = set()
+
+# ASCII fast path: lowercase, whitespace -> hyphen, drop everything else
+_FILENAME_TABLE = str.maketrans({
+    c: (chr(c).lower() if chr(c).isalnum() or chr(c) == '-'
+        else '-' if chr(c).isspace() else None)
+    for c in range(128)
+})
+
 
 def sanitize_filename(text: str, max_length: int = 30) -> str:
     """
@@ -38,17 +54,21 @@ def sanitize_filename(text: str, max_length: int = 30) -> str:
     if not text or not text.strip():
         return "untitled"
     
-    # Lowercase
-    result = text.lower()
-    
-    # Remove special characters, keep alphanumeric and spaces
-    result = re.sub(r'[^a-z0-9\s-]', '', result)
-    
-    # Replace spaces with hyphens
-    result = re.sub(r'\s+', '-', result)
+    if text.isascii():
+        # One translate pass does the lowercase/strip/space steps below
+        result = text.translate(_FILENAME_TABLE)
+    else:
+        # Lowercase
+        result = text.lower()
+        
+        # Remove special characters, keep alphanumeric and spaces
+        result = _NON_ALNUM_RE.sub('', result)
+        
+        # Replace spaces with hyphens
+        result = _WHITESPACE_RE.sub('-', result)
     
     # Collapse multiple hyphens
-    result = re.sub(r'-+', '-', result)
+    result = _HYPHEN_RUN_RE.sub('-', result)
     
     # Strip leading/trailing hyphens
     result = result.strip('-')
@@ -93,7 +113,8 @@ def build_frontmatter(
     # Quote reasoning if it contains special characters
     reasoning = _quote_yaml_value(classification.reasoning)
 
-    frontmatter = f"""---
+    # Keys every note has; plain captures return without the line list
+    core = f"""---
 domain: {classification.domain}
 para_type: {classification.para_type}
 subject: {classification.subject}
@@ -103,17 +124,22 @@ reasoning: {reasoning}
 created: {timestamp}
 tags: []"""
 
+    if not task_info and not source_info:
+        return core + "\n---"
+
+    lines = [core]
+
     if task_info:
-        frontmatter += "\ntype: task"
-        frontmatter += f"\nstatus: {task_info.get('status', 'backlog')}"
+        lines.append("type: task")
+        lines.append(f"status: {task_info.get('status', 'backlog')}")
         if task_info.get("board"):
-            frontmatter += f"\nboard: {task_info['board']}"
+            lines.append(f"board: {task_info['board']}")
         if task_info.get("priority"):
-            frontmatter += f"\npriority: {task_info['priority']}"
+            lines.append(f"priority: {task_info['priority']}")
         if task_info.get("project"):
-            frontmatter += f"\nproject: {task_info['project']}"
+            lines.append(f"project: {task_info['project']}")
         if task_info.get("view"):
-            frontmatter += f"\nview: {task_info['view']}"
+            lines.append(f"view: {task_info['view']}")
 
     if source_info:
         source = _quote_yaml_value(source_info.get("source"))
@@ -130,22 +156,92 @@ tags: []"""
         else:
             verified_value = ""
 
-        frontmatter += f"\nsource: {source}"
+        lines.append(f"source: {source}")
         if source_url:
-            frontmatter += f"\nsource_url: {source_url}"
+            lines.append(f"source_url: {source_url}")
         if source_title:
-            frontmatter += f"\nsource_title: {source_title}"
+            lines.append(f"source_title: {source_title}")
         if source_channel:
-            frontmatter += f"\nsource_channel: {source_channel}"
+            lines.append(f"source_channel: {source_channel}")
         if source_published:
-            frontmatter += f"\nsource_published: {source_published}"
+            lines.append(f"source_published: {source_published}")
         if status:
-            frontmatter += f"\nstatus: {status}"
+            lines.append(f"status: {status}")
         if verified_value:
-            frontmatter += f"\nverified: {verified_value}"
+            lines.append(f"verified: {verified_value}")
+
+    lines.append("---")
+    return "\n".join(lines)
+
+
+def _ensure_folder(folder: Path) -> None:
+    """Create a note folder unless this process already has."""
+    if folder not in _KNOWN_FOLDERS:
+        # Usually only the subject folder is new: try mkdir(2) on it
+        # directly and fall back to creating parents if that fails
+        try:
+            os.mkdir(folder)
+        except FileExistsError:
+            pass
+        except FileNotFoundError:
+            folder.mkdir(parents=True, exist_ok=True)
+        _KNOWN_FOLDERS.add(folder)
+
+
+def _file_timestamp(now: datetime) -> str:
+    """Format a datetime as YYYYMMDD-HHMMSS for note filenames (no strftime)."""
+    return (
+        f"{now.year:04d}{now.month:02d}{now.day:02d}-"
+        f"{now.hour:02d}{now.minute:02d}{now.second:02d}"
+    )
+
+
+def _write_note(filepath: Path, content: str) -> None:
+    """Write a note with one open and, normally, one os.write."""
+    data = content.encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC
+    try:
+        fd = os.open(filepath, flags, 0o666)
+    except FileNotFoundError:
+        # Folder was deleted or renamed (e.g. in Obsidian) after this
+        # process cached it: forget it, recreate it and try once more
+        _KNOWN_FOLDERS.discard(filepath.parent)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        _KNOWN_FOLDERS.add(filepath.parent)
+        fd = os.open(filepath, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _note_content(
+    classification: "ClassificationResult",
+    message_text: str,
+    timestamp: str,
+    task_info: Optional[dict] = None,
+) -> str:
+    """Build the full markdown (frontmatter + body) for a captured note."""
+    frontmatter = build_frontmatter(classification, timestamp, task_info=task_info)
+    
+    body = f"""
+## Original Capture
+
+{message_text}
+
+## Classification
 
-    frontmatter += "\n---"
-    return frontmatter
+- **Domain:** {classification.domain}
+- **PARA Type:** {classification.para_type}
+- **Subject:** {classification.subject}
+- **Category:** {classification.category}
+- **Confidence:** {classification.confidence:.0%}
+- **Reasoning:** {classification.reasoning}
+"""
+    
+    return frontmatter + body
 
 
 def create_note_file(
@@ -171,38 +267,22 @@ def create_note_file(
     File structure:
         vault_path / domain / para_type / subject / {timestamp}-{title}.md
     """
+    now = datetime.now()
     if timestamp is None:
-        timestamp = datetime.now().isoformat()
+        timestamp = now.isoformat()
 
     folder = vault_path / classification.domain / classification.para_type / classification.subject
-    folder.mkdir(parents=True, exist_ok=True)
+    _ensure_folder(folder)
 
-    file_timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    file_timestamp = _file_timestamp(now)
     sanitized_title = sanitize_filename(message_text)
     filename = f"{file_timestamp}-{sanitized_title}.md"
     filepath = folder / filename
 
-    frontmatter = build_frontmatter(classification, timestamp, task_info=task_info)
-    
-    body = f"""
-## Original Capture
-
-{message_text}
-
-## Classification
-
-- **Domain:** {classification.domain}
-- **PARA Type:** {classification.para_type}
-- **Subject:** {classification.subject}
-- **Category:** {classification.category}
-- **Confidence:** {classification.confidence:.0%}
-- **Reasoning:** {classification.reasoning}
-"""
-    
-    content = frontmatter + body
+    content = _note_content(classification, message_text, timestamp, task_info)
     
     # Write file
-    filepath.write_text(content)
+    _write_note(filepath, content)
 
     return filepath
 
@@ -261,13 +341,14 @@ def create_youtube_note_file(
     """
     Create a YouTube note file with source metadata and structured sections.
     """
+    now = datetime.now()
     if timestamp is None:
-        timestamp = datetime.now().isoformat()
+        timestamp = now.isoformat()
 
     folder = vault_path / classification.domain / classification.para_type / classification.subject
-    folder.mkdir(parents=True, exist_ok=True)
+    _ensure_folder(folder)
 
-    file_timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    file_timestamp = _file_timestamp(now)
     sanitized_title = sanitize_filename(title or source_title or "youtube-note")
     filename = f"{file_timestamp}-{sanitized_title}.md"
     filepath = folder / filename
@@ -297,7 +378,7 @@ def create_youtube_note_file(
         transcript_rel_path=transcript_rel_path,
     )
 
-    filepath.write_text(frontmatter + body)
+    _write_note(filepath, frontmatter + body)
     return filepath
 
 
@@ -313,7 +394,16 @@ def safe_attachment_filename(original_name: str, existing: Optional[set] = None)
     name = stem + ext
     if name not in existing:
         return name
-    i = 1
+    # One pass over existing finds the highest suffix already taken, so
+    # large batches sharing a stem don't re-probe _1, _2, ... each time
+    prefix = stem + "_"
+    suffix_re = re.compile(rf"{re.escape(prefix)}(\d+){re.escape(ext)}")
+    taken = [
+        int(m.group(1))
+        for m in (suffix_re.fullmatch(n) for n in existing if n.startswith(prefix))
+        if m
+    ]
+    i = max(taken) + 1 if taken else 1
     while f"{stem}_{i}{ext}" in existing:
         i += 1
     return f"{stem}_{i}{ext}"
@@ -330,10 +420,14 @@ def append_attachments_section(note_path: Path, links: List[Tuple[str, str]]) ->
     if not links:
         return
     section = "\n\n## Attachments\n\n" + "\n".join(f"- [{name}]({path})" for name, path in links)
-    content = note_path.read_text()
-    if "## Attachments" in content:
-        return  # Already has attachments, avoid duplicate
-    note_path.write_text(content.rstrip() + section + "\n")
+    # Append in place: one open, and existing bytes are never rewritten
+    with open(note_path, "rb+") as f:
+        content = f.read()
+        if b"## Attachments" in content:
+            return  # Already has attachments, avoid duplicate
+        f.seek(len(content.rstrip()))
+        f.write((section + "\n").encode("utf-8"))
+        f.truncate()
 
 
 # Convenience function for simple file creation
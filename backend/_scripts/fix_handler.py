@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 """Handle fix: commands in Slack thread replies."""
 
+import os
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-import yaml
 
 # Use shared Slack client with retry logic
 from slack_client import (
@@ -13,11 +15,37 @@ from slack_client import (
     reply_to_message,
 )
 
-# State management for message-to-file mapping
-from state import get_file_for_message, update_file_location
+# State management for message-to-file mapping and fix idempotency
+from state import (
+    get_file_for_message,
+    update_file_location,
+    is_message_processed,
+    mark_message_processed,
+)
 
 VAULT_PATH = Path.home() / "SecondBrain"
 
+# Concurrent conversations.replies calls (stays under Slack tier-3 limits)
+REPLIES_FETCH_WORKERS = 8
+
+_FIX_RE = re.compile(r"fix:\s*(\w+)", re.IGNORECASE)
+_VALID_DESTS = frozenset(("people", "projects", "ideas", "admin"))
+_TYPE_MAP = {
+    "people": "person",
+    "projects": "project",
+    "ideas": "idea",
+    "admin": "admin",
+}
+
+# Top-level frontmatter lines move_file updates in place
+_MOVE_KEY_RES = {
+    key: re.compile(rf"^{key}:[^\r\n]*", re.MULTILINE)
+    for key in ("type", "moved_from", "moved_at")
+}
+
+# Destination folders already created/confirmed this process
+_EXISTING_FOLDERS = set()
+
 
 def move_file(filepath, new_destination):
     """
@@ -30,7 +58,13 @@ def move_file(filepath, new_destination):
         return None
 
     new_folder = VAULT_PATH / new_destination
-    new_folder.mkdir(parents=True, exist_ok=True)
+    if filepath.parent == new_folder:
+        # Already there (e.g. the same fix: sent twice); nothing to rewrite
+        return filepath
+
+    if new_folder not in _EXISTING_FOLDERS:
+        new_folder.mkdir(parents=True, exist_ok=True)
+        _EXISTING_FOLDERS.add(new_folder)
 
     new_filepath = new_folder / filepath.name
 
@@ -40,46 +74,85 @@ def move_file(filepath, new_destination):
         stem = filepath.stem
         new_filepath = new_folder / f"{stem}-moved-{timestamp}.md"
 
-    filepath.rename(new_filepath)
+    os.rename(filepath, new_filepath)
 
     # Update frontmatter to record the move
     try:
-        content = new_filepath.read_text()
-        if "---" in content:
-            parts = content.split("---")
-            if len(parts) >= 2:
-                fm = yaml.safe_load(parts[1])
-                if fm:
-                    fm["type"] = _get_type_for_destination(new_destination)
-                    fm["moved_from"] = filepath.parent.name
-                    fm["moved_at"] = datetime.now().isoformat()
-
-                    # Rewrite with updated frontmatter
-                    new_content = "---\n"
-                    for k, v in fm.items():
-                        if isinstance(v, list):
-                            new_content += f"{k}:\n"
-                            for item in v:
-                                new_content += f"  - {item}\n"
-                        else:
-                            new_content += f"{k}: {v}\n"
-                    new_content += "---\n" + "---".join(parts[2:])
-                    new_filepath.write_text(new_content)
+        header, body_offset = _read_frontmatter(new_filepath)
+        if header is not None and header.strip():
+            header = _set_frontmatter_keys(header, {
+                "type": _get_type_for_destination(new_destination),
+                "moved_from": filepath.parent.name,
+                "moved_at": datetime.now().isoformat(),
+            })
+            _rewrite_frontmatter(
+                new_filepath, f"---\n{header}---\n".encode("utf-8"), body_offset
+            )
     except Exception as e:
         print(f"Error updating frontmatter: {e}")
 
     return new_filepath
 
 
+def _read_frontmatter(filepath):
+    """
+    Read only the YAML frontmatter block at the top of a note.
+
+    Stops at the closing --- so the body is never loaded.
+
+    Returns:
+        (frontmatter text, byte offset where the body starts),
+        or (None, 0) if the file has no frontmatter.
+    """
+    with open(filepath, "rb") as f:
+        if f.readline().rstrip(b"\r\n") != b"---":
+            return None, 0
+        lines = []
+        while True:
+            line = f.readline()
+            if not line:
+                return None, 0
+            if line.rstrip(b"\r\n") == b"---":
+                return b"".join(lines).decode("utf-8"), f.tell()
+            lines.append(line)
+
+
+def _set_frontmatter_keys(header, updates):
+    """
+    Set top-level keys in raw frontmatter text without parsing the YAML.
+
+    Existing lines are replaced in place; missing keys are appended.
+    All other lines are kept byte-for-byte.
+    """
+    for key, value in updates.items():
+        line = f"{key}: {value}"
+        header, count = _MOVE_KEY_RES[key].subn(lambda _: line, header, count=1)
+        if not count:
+            if header and not header.endswith("\n"):
+                header += "\n"
+            header += line + "\n"
+    return header
+
+
+def _rewrite_frontmatter(filepath, header, body_offset):
+    """Replace the frontmatter, copying the body across unparsed."""
+    if len(header) == body_offset:
+        # Same size (e.g. a note moved again): overwrite the header in place
+        with open(filepath, "r+b") as f:
+            f.write(header)
+        return
+
+    temp_path = filepath.with_suffix(".tmp")
+    with open(filepath, "rb") as src, open(temp_path, "wb") as dst:
+        dst.write(header)
+        src.seek(body_offset)
+        shutil.copyfileobj(src, dst)
+    os.replace(temp_path, filepath)
+
+
 def _get_type_for_destination(destination: str) -> str:
     """Get the frontmatter type for a destination folder."""
-    type_map = {
-        "people": "person",
-        "projects": "project",
-        "ideas": "idea",
-        "admin": "admin"
-    }
-    return type_map.get(destination, destination)
+    return _TYPE_MAP.get(destination, destination)
 
 
 def process_fix_commands():
@@ -87,46 +160,75 @@ def process_fix_commands():
     messages = fetch_messages(limit=50)
     processed = 0
 
+    # Only thread parents with replies can carry fix: commands; skip
+    # plain messages and replies broadcast into the channel history
+    thread_list = []
+    seen_threads = set()
     for msg in messages:
-        # Check if message has thread replies
-        if msg.get("thread_ts") or msg.get("reply_count", 0) > 0:
-            thread_ts = msg.get("thread_ts") or msg.get("ts")
-            original_ts = msg.get("ts")
-            replies = fetch_thread_replies(thread_ts)
-
-            for reply in replies:
-                text = reply.get("text", "").strip()
-                if text.lower().startswith("fix:"):
-                    # Extract destination
-                    match = re.match(r"fix:\s*(\w+)", text.lower())
-                    if match:
-                        new_dest = match.group(1)
-                        if new_dest in ["people", "projects", "ideas", "admin"]:
-                            # Find original file using message mapping
-                            filepath = get_file_for_message(original_ts)
-
-                            if filepath:
-                                # Move file
-                                new_filepath = move_file(filepath, new_dest)
-                                if new_filepath:
-                                    # Update the message mapping with new location
-                                    update_file_location(original_ts, new_filepath)
-
-                                    reply_to_message(
-                                        thread_ts,
-                                        f"✓ Moved to *{new_dest}* as `{new_filepath.name}`"
-                                    )
-                                    processed += 1
-                                else:
-                                    reply_to_message(
-                                        thread_ts,
-                                        "⚠️ Failed to move file"
-                                    )
-                            else:
-                                reply_to_message(
-                                    thread_ts,
-                                    "⚠️ Could not find original file (message not in mapping)"
-                                )
+        ts = msg.get("ts")
+        if msg.get("reply_count", 0) > 0 and msg.get("thread_ts", ts) == ts:
+            if ts not in seen_threads:
+                seen_threads.add(ts)
+                thread_list.append(ts)
+
+    # Replies fetches are independent network round-trips; overlap them
+    all_replies = []
+    if thread_list:
+        workers = min(REPLIES_FETCH_WORKERS, len(thread_list))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            all_replies = list(executor.map(fetch_thread_replies, thread_list))
+
+    for thread_ts, replies in zip(thread_list, all_replies):
+        original_ts = thread_ts
+
+        # Only the latest valid fix: in a thread counts; earlier ones were
+        # either handled by a previous run or superseded
+        for reply in reversed(replies):
+            text = reply.get("text", "").strip()
+            if text[:4].lower() != "fix:":
+                continue
+
+            # Extract destination
+            match = _FIX_RE.match(text)
+            if not match:
+                continue
+            new_dest = match.group(1).lower()
+            if new_dest not in _VALID_DESTS:
+                continue
+
+            reply_ts = reply.get("ts")
+            if is_message_processed(reply_ts):
+                break  # Already handled on an earlier run
+
+            # Find original file using message mapping
+            filepath = get_file_for_message(original_ts)
+
+            if filepath:
+                # Move file
+                new_filepath = move_file(filepath, new_dest)
+                if new_filepath:
+                    # Update the message mapping with new location
+                    update_file_location(original_ts, new_filepath)
+
+                    reply_to_message(
+                        thread_ts,
+                        f"✓ Moved to *{new_dest}* as `{new_filepath.name}`"
+                    )
+                    processed += 1
+                else:
+                    reply_to_message(
+                        thread_ts,
+                        "⚠️ Failed to move file"
+                    )
+            else:
+                reply_to_message(
+                    thread_ts,
+                    "⚠️ Could not find original file (message not in mapping)"
+                )
+
+            # Record the fix so later runs don't move or reply again
+            mark_message_processed(reply_ts)
+            break
 
     print(f"Processed {processed} fix commands")
 
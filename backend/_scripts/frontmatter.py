@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shared YAML frontmatter reader for vault notes.
+
+Reads only the head of a note and parses the block between the opening
+and closing --- markers.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+# Frontmatter almost always fits in the first page of a note
+HEAD_BYTES = 4096
+
+
+def load_frontmatter(path: Path) -> Optional[dict]:
+    """
+    Parse the YAML frontmatter at the top of a note.
+
+    The rest of the file is read only if the closing --- lies beyond
+    the first HEAD_BYTES.
+
+    Returns:
+        Frontmatter dict, or None if the note has no mapping frontmatter.
+
+    Raises:
+        OSError / yaml.YAMLError on unreadable files or invalid YAML.
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(HEAD_BYTES)
+        if not head.startswith(b"---") or head[3:4] not in (b"\n", b"\r"):
+            return None
+
+        end = head.find(b"\n---", 3)
+        if end < 0:
+            head += fh.read()
+            end = head.find(b"\n---", 3)
+            if end < 0:
+                return None
+
+    fm = yaml.load(head[3:end].decode("utf-8"), Loader=SafeLoader)
+    return fm if isinstance(fm, dict) else None
@@ -10,8 +10,6 @@ Verifies:
 Run via cron hourly or manually to monitor system health.
 """
 
-import os
-import shutil
 import sys
 from datetime import datetime
 
@@ -21,6 +19,7 @@ from state import (
     get_failed_count_today,
 )
 from slack_client import send_dm, SlackAPIError
+from youtube_checks import is_enabled as _youtube_checks_enabled, missing_dependencies
 
 
 def check_health(max_age_minutes: int = 60, alert: bool = True) -> tuple[bool, list[str]]:
@@ -119,21 +118,8 @@ def main():
         sys.exit(1)
 
 
-def _youtube_checks_enabled() -> bool:
-    value = (os.environ.get("YOUTUBE_INGEST_ENABLED") or os.environ.get("CHECK_YOUTUBE_DEPS") or "").strip().lower()
-    return value in {"1", "true", "yes", "on"}
-
-
 def check_youtube_dependencies() -> list[str]:
-    issues = []
-    if shutil.which("yt-dlp") is None:
-        issues.append("YouTube: yt-dlp not found")
-    if shutil.which("ffmpeg") is None:
-        issues.append("YouTube: ffmpeg not found")
-    mode = (os.environ.get("YOUTUBE_TRANSCRIPT_MODE") or "").strip().lower()
-    if mode == "whisper" and shutil.which("whisper") is None:
-        issues.append("YouTube: whisper not found (required for whisper mode)")
-    return issues
+    return [f"YouTube: {issue}" for issue in missing_dependencies()]
 
 
 if __name__ == "__main__":
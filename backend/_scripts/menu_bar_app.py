@@ -12,14 +12,18 @@ Usage:
     python menu_bar_app.py  # Starts the menu bar app
 """
 
+import functools
+import itertools
 import json
 import os
-import shutil
+import queue
 import subprocess
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 from urllib.parse import quote
 
 try:
@@ -29,8 +33,24 @@ except ImportError:
     RUMPS_AVAILABLE = False
     rumps = None
 
+# orjson is optional; it writes UTF-8 bytes directly and its
+# JSONDecodeError subclasses json's
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Notifications are optional: without them notes are still filed, silently
+try:
+    from notifications import notify_note_filed
+except ImportError:
+    def notify_note_filed(*args, **kwargs):
+        """No-op stand-in when notifications can't be imported."""
+
 from ollama_client import OllamaClient
 from process_inbox import process_all
+from vault_scanner import VAULT_ROOT
+from youtube_checks import is_enabled as _youtube_checks_enabled, missing_dependencies
 
 
 # Status icons
@@ -40,13 +60,19 @@ STATUS_ICONS = {
     "error": "⚠️",
 }
 
-VALID_STATUSES = list(STATUS_ICONS.keys())
+VALID_STATUSES = frozenset(STATUS_ICONS)
 
 # State directory for persistence
 STATE_DIR = Path(__file__).parent / ".state"
 RECENT_ACTIVITY_FILE = STATE_DIR / "recent_activity.json"
 MAX_RECENT_ACTIVITY = 5
 
+# Seconds a vault presence check is reused by health_check
+VAULT_CHECK_TTL = 30.0
+
+# Seconds between checks for new recent activity to show in the menu
+RECENT_REFRESH_INTERVAL = 10
+
 
 class MenuBarCore:
     """
@@ -59,10 +85,20 @@ class MenuBarCore:
     def __init__(self, state_dir: Optional[Path] = None):
         """Initialize core state."""
         self.status = "idle"
+        self._status_icon = STATUS_ICONS["idle"]
         self.error_message: Optional[str] = None
         self._state_dir = state_dir or STATE_DIR
         self._sync_lock = threading.Lock()
         self._recent_activity_file = self._state_dir / "recent_activity.json"
+        # (stat key, bounded deque) of the last read/write of the activity file
+        self._activity_cache: tuple = (None, deque(maxlen=MAX_RECENT_ACTIVITY))
+        # Bumped whenever the cached activity is replaced
+        self._activity_version = 0
+        self._activity_lock = threading.Lock()
+        # Reused across health checks so its HTTP connections are kept
+        self._ollama_client: Optional[OllamaClient] = None
+        # (monotonic time, vault is a directory) of the last vault check
+        self._vault_check_cache: Optional[tuple] = None
     
     def set_status(self, status: str, message: Optional[str] = None):
         """
@@ -76,14 +112,15 @@ class MenuBarCore:
             ValueError: If status is not valid
         """
         if status not in VALID_STATUSES:
-            raise ValueError(f"Invalid status: {status}. Must be one of {VALID_STATUSES}")
+            raise ValueError(f"Invalid status: {status}. Must be one of {list(STATUS_ICONS)}")
         
         self.status = status
+        self._status_icon = STATUS_ICONS[status]
         self.error_message = message if status == "error" else None
     
     def get_status_icon(self) -> str:
         """Get the icon for current status."""
-        return STATUS_ICONS.get(self.status, STATUS_ICONS["idle"])
+        return self._status_icon
     
     def get_recent_activity(self) -> List[Dict]:
         """
@@ -92,16 +129,43 @@ class MenuBarCore:
         Returns:
             List of recent activity dicts with title, domain, path, timestamp
         """
-        self._state_dir.mkdir(parents=True, exist_ok=True)
-        
-        if not self._recent_activity_file.exists():
-            return []
+        with self._activity_lock:
+            return list(self._read_recent_activity())
+    
+    def get_activity_version(self) -> int:
+        """
+        Get a counter that changes whenever recent activity changes.
         
+        Lets the UI skip rebuilding the recent menu when nothing is new.
+        """
+        with self._activity_lock:
+            self._read_recent_activity()
+            return self._activity_version
+    
+    def _read_recent_activity(self) -> deque:
+        """Parse the activity file, reusing the cached deque while it is unchanged."""
         try:
-            with open(self._recent_activity_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
+            st = os.stat(self._recent_activity_file)
+        except OSError:
+            if self._activity_cache[0] is not None:
+                self._set_activity_cache(None, deque(maxlen=MAX_RECENT_ACTIVITY))
+            return self._activity_cache[1]
+        
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._activity_cache[0] != key:
+            try:
+                with open(self._recent_activity_file, 'rb') as f:
+                    # The file is newest-first: keep its head, not its tail
+                    items = itertools.islice(_loads_activity(f.read()), MAX_RECENT_ACTIVITY)
+                    activity = deque(items, maxlen=MAX_RECENT_ACTIVITY)
+            except (json.JSONDecodeError, IOError):
+                activity = deque(maxlen=MAX_RECENT_ACTIVITY)
+            self._set_activity_cache(key, activity)
+        return self._activity_cache[1]
+    
+    def _set_activity_cache(self, key, activity: deque):
+        self._activity_cache = (key, activity)
+        self._activity_version += 1
     
     def add_recent_activity(self, title: str, domain: str, path: str):
         """
@@ -114,23 +178,29 @@ class MenuBarCore:
         """
         self._state_dir.mkdir(parents=True, exist_ok=True)
         
-        activity = self.get_recent_activity()
-        
         # Add new item at front
         new_item = {
             "title": title,
             "domain": domain,
             "path": path,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(timespec="seconds")
         }
-        activity.insert(0, new_item)
-        
-        # Cap at max
-        activity = activity[:MAX_RECENT_ACTIVITY]
         
-        # Save
-        with open(self._recent_activity_file, 'w') as f:
-            json.dump(activity, f, indent=2)
+        with self._activity_lock:
+            # Bounded deque drops the oldest item past MAX_RECENT_ACTIVITY;
+            # copy so a failed write leaves the cache matching the file
+            activity = self._read_recent_activity().copy()
+            activity.appendleft(new_item)
+            
+            # Write a temp file and swap it in so a crash can't leave a torn
+            # file; the renamed inode keeps the stat key taken here
+            temp_path = self._recent_activity_file.with_suffix(".json.tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(_dumps_activity(list(activity)))
+                f.flush()
+                st = os.fstat(f.fileno())
+            os.replace(temp_path, self._recent_activity_file)
+            self._set_activity_cache((st.st_ino, st.st_mtime_ns, st.st_size), activity)
     
     def health_check(self) -> Dict:
         """
@@ -147,31 +217,29 @@ class MenuBarCore:
         
         # Check Ollama
         try:
-            client = OllamaClient()
-            status = client.health_check()
+            if self._ollama_client is None:
+                self._ollama_client = OllamaClient()
+            status = self._ollama_client.health_check()
             result["ollama"]["ready"] = status.ready
             result["ollama"]["error"] = status.error
         except Exception as e:
             result["ollama"]["error"] = str(e)
         
         # Check vault
-        from vault_scanner import VAULT_ROOT
         vault_path = VAULT_ROOT
-        if vault_path.exists() and vault_path.is_dir():
+        now = time.monotonic()
+        cached = self._vault_check_cache
+        if cached is None or now - cached[0] >= VAULT_CHECK_TTL:
+            # is_dir() is False for missing paths too: one stat covers both
+            cached = self._vault_check_cache = (now, vault_path.is_dir())
+        if cached[1]:
             result["vault"]["ready"] = True
         else:
             result["vault"]["error"] = f"Vault not found at {vault_path}"
 
         # Optional: YouTube dependency checks (only when enabled)
         if _youtube_checks_enabled():
-            yt_errors = []
-            if shutil.which("yt-dlp") is None:
-                yt_errors.append("yt-dlp not found")
-            if shutil.which("ffmpeg") is None:
-                yt_errors.append("ffmpeg not found")
-            transcript_mode = (os.environ.get("YOUTUBE_TRANSCRIPT_MODE") or "").strip().lower()
-            if transcript_mode == "whisper" and shutil.which("whisper") is None:
-                yt_errors.append("whisper not found (required for whisper mode)")
+            yt_errors = missing_dependencies()
             if yt_errors:
                 result["youtube"]["ready"] = False
                 result["youtube"]["error"] = "; ".join(yt_errors)
@@ -200,40 +268,53 @@ class MenuBarCore:
             self._sync_lock.release()
 
 
-def open_note(path: str):
+def _loads_activity(data: bytes) -> list:
+    """Decode the recent-activity file contents."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_activity(activity: list) -> bytes:
+    """Encode recent activity as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(activity)
+    return json.dumps(activity, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def open_note(path: Union[str, Path]):
     """
     Open a note in Obsidian.
     
     Args:
-        path: Absolute path to the note file
+        path: Absolute path to the note file (str or Path)
     """
-    from vault_scanner import VAULT_ROOT
     vault_path = VAULT_ROOT
-    try:
-        note_path = Path(path)
-        if note_path.is_relative_to(vault_path):
-            relative_path = note_path.relative_to(vault_path)
-        else:
-            relative_path = note_path.name
-    except (ValueError, TypeError):
-        relative_path = Path(path).name
+    # Plain string ops: a prefix check instead of is_relative_to/relative_to
+    note_path = os.fspath(path)
+    vault_prefix = os.path.join(os.fspath(vault_path), "")
+    if note_path.startswith(vault_prefix):
+        relative_path = note_path[len(vault_prefix):]
+    else:
+        relative_path = os.path.basename(note_path)
+    if relative_path.endswith(".md"):
+        relative_path = relative_path[:-3]
     
     # Build Obsidian URL (vault name = folder name, e.g. Home)
-    encoded_path = quote(str(relative_path).replace('.md', ''))
-    vault_name = vault_path.name
-    obsidian_url = f"obsidian://open?vault={quote(vault_name)}&file={encoded_path}"
+    encoded_path = quote(relative_path)
+    obsidian_url = _obsidian_url_prefix(vault_path.name) + encoded_path
     
     # Open URL
     subprocess.run(["open", obsidian_url], check=False)
 
 
-def _youtube_checks_enabled() -> bool:
-    value = (os.environ.get("YOUTUBE_INGEST_ENABLED") or os.environ.get("CHECK_YOUTUBE_DEPS") or "").strip().lower()
-    return value in {"1", "true", "yes", "on"}
+@functools.lru_cache(maxsize=None)
+def _obsidian_url_prefix(vault_name: str) -> str:
+    """Quoted obsidian://open prefix for a vault; only the file part varies."""
+    return f"obsidian://open?vault={quote(vault_name)}&file="
 
 
 def _infer_domain_from_path(note_path: Path) -> Optional[str]:
-    from vault_scanner import VAULT_ROOT
     try:
         rel = Path(note_path).relative_to(VAULT_ROOT)
     except ValueError:
@@ -253,18 +334,34 @@ class MenuBarApp:
         """Initialize the menu bar app."""
         self._core = core or MenuBarCore()
         self._rumps_app = None
+        # Status icon last shown in the menu bar
+        self._last_title = None
+        # Recent activity submenu and the activity version it shows
+        self._recent_menu = None
+        self._recent_menu_version = None
+        self._recent_timer = None
+        # Background work from menu callbacks runs one item at a time on a
+        # single worker thread, started on first use
+        self._work_queue = queue.Queue()
+        self._worker = None
+        # Set while a sync is queued or running; further Sync clicks are
+        # dropped, as the core's sync lock used to do
+        self._sync_pending = threading.Event()
         
         if RUMPS_AVAILABLE:
             self._init_rumps()
     
     def _init_rumps(self):
         """Initialize rumps app (only when rumps available)."""
+        self._last_title = self._core.get_status_icon()
         self._rumps_app = rumps.App(
             name="Second Brain",
-            title=self._core.get_status_icon(),
+            title=self._last_title,
             quit_button=None
         )
         self._build_menu()
+        self._recent_timer = rumps.Timer(self._refresh_recent_menu, RECENT_REFRESH_INTERVAL)
+        self._recent_timer.start()
     
     def _build_menu(self):
         """Build the menu structure."""
@@ -289,11 +386,27 @@ class MenuBarApp:
     
     def _build_recent_menu(self):
         """Build the recent activity submenu."""
-        recent_menu = rumps.MenuItem("Recent Activity")
+        self._recent_menu = rumps.MenuItem("Recent Activity")
+        self._fill_recent_menu()
+        return self._recent_menu
+    
+    def _refresh_recent_menu(self, sender=None):
+        """Timer callback: refill the recent submenu if activity has changed."""
+        if self._recent_menu is None:
+            return
+        if self._core.get_activity_version() == self._recent_menu_version:
+            return
+        self._recent_menu.clear()
+        self._fill_recent_menu()
+    
+    def _fill_recent_menu(self):
+        """Add an item per recent activity entry to the (empty) recent submenu."""
+        # Read the version first so a change made meanwhile is caught next tick
+        self._recent_menu_version = self._core.get_activity_version()
         activity = self._core.get_recent_activity()
         
         if not activity:
-            recent_menu.add(rumps.MenuItem("No recent activity"))
+            self._recent_menu.add(rumps.MenuItem("No recent activity"))
         else:
             for item in activity:
                 title = item.get('title', 'Untitled')
@@ -302,14 +415,32 @@ class MenuBarApp:
                 menu_item = rumps.MenuItem(title)
                 # Store path for callback
                 menu_item._note_path = item.get('path')
-                recent_menu.add(menu_item)
-        
-        return recent_menu
+                self._recent_menu.add(menu_item)
     
+    def _submit(self, fn, *args):
+        """Queue fn(*args) for the background worker thread."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
+        self._work_queue.put((fn, args))
+
+    def _worker_loop(self):
+        """Run queued work items in order for the life of the app."""
+        while True:
+            fn, args = self._work_queue.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Background task failed: {e}")
+            finally:
+                self._work_queue.task_done()
+
     def _sync_callback(self, sender):
         """Callback for sync menu item."""
-        thread = threading.Thread(target=self._do_sync_threaded, daemon=True)
-        thread.start()
+        if self._sync_pending.is_set():
+            return
+        self._sync_pending.set()
+        self._submit(self._do_sync_threaded)
 
     def _ingest_youtube_callback(self, sender):
         """Prompt for YouTube URL and ingest in background."""
@@ -335,25 +466,28 @@ class MenuBarApp:
         domain_response = domain_window.run()
         domain = (domain_response.text or "").strip() if domain_response.clicked else ""
 
-        thread = threading.Thread(
-            target=self._do_youtube_ingest_threaded,
-            args=(url, domain or None),
-            daemon=True,
-        )
-        thread.start()
+        self._submit(self._do_youtube_ingest_threaded, url, domain or None)
     
     def _do_sync_threaded(self):
         """Run sync in background thread."""
-        self._core.do_sync()
-        if self._rumps_app:
-            self._rumps_app.title = self._core.get_status_icon()
+        try:
+            self._core.do_sync()
+            self._set_title_if_changed(self._core.get_status_icon())
+        finally:
+            self._sync_pending.clear()
+
+    def _set_title_if_changed(self, icon: str):
+        """Update the menu bar title, skipping the UI call if it is already shown."""
+        if not self._rumps_app or icon == self._last_title:
+            return
+        self._rumps_app.title = icon
+        self._last_title = icon
 
     def _do_youtube_ingest_threaded(self, url: str, domain: Optional[str]):
         """Run YouTube ingestion in background thread."""
         try:
             self._core.set_status("syncing")
-            if self._rumps_app:
-                self._rumps_app.title = self._core.get_status_icon()
+            self._set_title_if_changed(self._core.get_status_icon())
 
             from youtube_ingest import ingest_youtube
             note_path = ingest_youtube(url, domain=domain)
@@ -364,7 +498,6 @@ class MenuBarApp:
                 self._core.add_recent_activity(title, domain_name, str(note_path))
 
                 try:
-                    from notifications import notify_note_filed
                     notify_note_filed(
                         title=title,
                         domain=domain_name,
@@ -381,8 +514,7 @@ class MenuBarApp:
             self._core.set_status("error", str(e)[:50])
             rumps.alert("YouTube ingest failed", str(e)[:300])
         finally:
-            if self._rumps_app:
-                self._rumps_app.title = self._core.get_status_icon()
+            self._set_title_if_changed(self._core.get_status_icon())
     
     def _quit_callback(self, sender):
         """Callback for quit menu item."""
@@ -401,8 +533,7 @@ class MenuBarApp:
     def set_status(self, status: str, message: Optional[str] = None):
         """Set app status."""
         self._core.set_status(status, message)
-        if self._rumps_app:
-            self._rumps_app.title = self._core.get_status_icon()
+        self._set_title_if_changed(self._core.get_status_icon())
     
     def get_recent_activity(self) -> List[Dict]:
         """Get recent activity."""
@@ -423,7 +554,7 @@ class MenuBarApp:
         else:
             self._core.do_sync()
     
-    def open_note(self, path: str):
+    def open_note(self, path: Union[str, Path]):
         """Open note in Obsidian."""
         open_note(path)
     
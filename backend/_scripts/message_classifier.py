@@ -11,17 +11,34 @@ Classifies messages into four levels using local LLM:
 Uses vocabulary from VaultScanner to constrain classifications.
 """
 
+import functools
 import json
 import os
 import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from ollama_client import OllamaClient, OllamaError
+# orjson is optional; its JSONDecodeError subclasses json's
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+from ollama_client import OllamaClient, OllamaError, OllamaFormatUnsupported
 from vault_scanner import VaultScanner
 
 
+# Default: repo docs/sop relative to this script (backend/_scripts -> repo root)
+_DEFAULT_SOP_ROOT = Path(__file__).resolve().parent.parent.parent / "docs" / "sop"
+
+
 def _load_sop(sop_root: Optional[Path] = None) -> str:
     """
     Load SOP markdown files from docs/sop/ and return concatenated content.
@@ -29,12 +46,13 @@ def _load_sop(sop_root: Optional[Path] = None) -> str:
     """
     if sop_root is None:
         env_path = os.environ.get("SOP_PATH")
-        if env_path:
-            sop_root = Path(env_path)
-        else:
-            # Default: repo docs/sop relative to this script (backend/_scripts -> repo root)
-            repo_root = Path(__file__).resolve().parent.parent.parent
-            sop_root = repo_root / "docs" / "sop"
+        sop_root = Path(env_path) if env_path else _DEFAULT_SOP_ROOT
+    return _read_sop(sop_root)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_sop(sop_root: Path) -> str:
+    """Read and join the SOP files under sop_root (cached; see invalidate_cache)."""
     if not sop_root.is_dir():
         return ""
     order = ("naming.md", "folder-rules.md", "tasks.md")
@@ -52,12 +70,29 @@ VALID_CATEGORIES = ["meeting", "task", "idea", "reference", "journal", "question
 # Valid PARA types
 VALID_PARA_TYPES = ["1_Projects", "2_Areas", "3_Resources", "4_Archive"]
 
+# Casefolded lookups for the fixed vocabularies
+_CATEGORY_MAP = {valid.casefold(): valid for valid in VALID_CATEGORIES}
+_PARA_TYPE_MAP = {valid.casefold(): valid for valid in VALID_PARA_TYPES}
+# (casefolded, suffix after the number, canonical) for partial PARA matches
+_PARA_TYPE_PARTIALS = [
+    (valid.casefold(), valid.casefold().split("_")[-1], valid) for valid in VALID_PARA_TYPES
+]
+
 # Defaults for normalization
 DEFAULT_DOMAIN = "Personal"
 DEFAULT_PARA_TYPE = "3_Resources"
 DEFAULT_CATEGORY = "reference"
 DEFAULT_SUBJECT = "general"
 DEFAULT_CONFIDENCE = 0.5
+FAST_PATH_CONFIDENCE = 0.9
+
+# Token cap for one classification reply; the JSON object with a short
+# reasoning fits well inside it
+CLASSIFY_NUM_PREDICT = 256
+_REPLY_OPTIONS = {"num_predict": CLASSIFY_NUM_PREDICT}
+
+# Classification results kept per classifier for repeated messages
+RESULT_CACHE_SIZE = 1024
 
 # Classification mode: "single" (one shot) or "pipeline" (domain → para → subject+category)
 CLASSIFICATION_MODE_ENV = "CLASSIFICATION_MODE"
@@ -65,10 +100,83 @@ OLLAMA_MODEL_DOMAIN_ENV = "OLLAMA_MODEL_DOMAIN"
 OLLAMA_MODEL_PARA_ENV = "OLLAMA_MODEL_PARA"
 OLLAMA_MODEL_FULL_ENV = "OLLAMA_MODEL_FULL"
 
+CLASSIFICATION_RULES = """RULES:
+- domain MUST be one from the Domains list
+- para_type MUST be one from PARA Types
+- subject should be from the domain's subjects, or "general" if none fit
+- category MUST be one from Categories
+- confidence between 0.0 and 1.0 based on certainty
+- reasoning should be a brief explanation"""
+
+
+# Decoder for pulling the first JSON object out of free-form model output
+_DECODER = json.JSONDecoder()
+
+# Per-field fallbacks when the response holds no decodable JSON object
+_FIELD_PATTERNS = [
+    ("domain", re.compile(r'"domain"\s*:\s*"([^"]+)"')),
+    ("para_type", re.compile(r'"para_type"\s*:\s*"([^"]+)"')),
+    ("subject", re.compile(r'"subject"\s*:\s*"([^"]+)"')),
+    ("category", re.compile(r'"category"\s*:\s*"([^"]+)"')),
+    ("confidence", re.compile(r'"confidence"\s*:\s*([0-9.]+)')),
+    ("reasoning", re.compile(r'"reasoning"\s*:\s*"([^"]+)"')),
+]
+
+# Category cues for the rule-based fast path; a message must hit exactly one
+_CATEGORY_CUES = [
+    ("meeting", re.compile(r"\b(?:meeting|standup|stand-up|sync|call with)\b", re.IGNORECASE)),
+    ("task", re.compile(r"\b(?:todo|to-do|task|remind me|deadline)\b", re.IGNORECASE)),
+    ("question", re.compile(r"\?\s*$")),
+]
+
+
+# Structured-output schemas (Ollama format=) keep replies parseable
+_CONFIDENCE_SCHEMA = {"type": "number", "minimum": 0, "maximum": 1}
+_STRING_SCHEMA = {"type": "string"}
+
 
-@dataclass
+def _object_schema(**properties) -> Dict:
+    """JSON schema for an object whose listed properties are all required."""
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+def _enum(values: List[str]) -> Dict:
+    """JSON schema for a string limited to values (any string if there are none)."""
+    return {"type": "string", "enum": list(values)} if values else _STRING_SCHEMA
+
+
+def _term_pattern(term: str) -> Optional[re.Pattern]:
+    """Regex matching term as a whole word or phrase in casefolded text (None if empty)."""
+    term = term.casefold()
+    return re.compile(rf"(?<![\w-]){re.escape(term)}(?![\w-])") if term else None
+
+
+def _extract_json(raw: str) -> Optional[Dict]:
+    """
+    Return the first complete JSON object in raw, or None.
+
+    Decodes from each "{" in turn, so text before or after the object and
+    braces nested inside string values are both handled.
+    """
+    idx = raw.find("{")
+    if idx != -1 and orjson is not None:
+        # Usually the reply is just the object; one orjson call settles it
+        try:
+            return orjson.loads(raw[idx:raw.rfind("}") + 1])
+        except orjson.JSONDecodeError:
+            pass
+    while idx != -1:
+        try:
+            return _DECODER.raw_decode(raw, idx)[0]
+        except ValueError:
+            idx = raw.find("{", idx + 1)
+    return None
+
+
+# slots= needs Python 3.10+; 3.9 still gets the frozen record
+@dataclass(frozen=True, **({"slots": True} if sys.version_info >= (3, 10) else {}))
 class ClassificationResult:
-    """Result of message classification."""
+    """Result of message classification (immutable)."""
     domain: str
     para_type: str
     subject: str
@@ -94,7 +202,8 @@ class MessageClassifier:
     def __init__(
         self,
         ollama_client: Optional[OllamaClient] = None,
-        vault_scanner: Optional[VaultScanner] = None
+        vault_scanner: Optional[VaultScanner] = None,
+        preload: bool = False
     ):
         """
         Initialize classifier with optional custom clients.
@@ -102,10 +211,46 @@ class MessageClassifier:
         Args:
             ollama_client: OllamaClient instance (default: new OllamaClient())
             vault_scanner: VaultScanner instance (default: new VaultScanner())
+            preload: Load the classification model(s) in a background thread
+                so the first classify() doesn't pay the cold start
         """
         self._ollama_client = ollama_client or OllamaClient()
         self._vault_scanner = vault_scanner or VaultScanner()
+        # Cleared if the server turns out not to support structured outputs
+        self._structured_output = True
+        # ((domains, structure, SOP text), section) for the last prompt section
+        self._vocabulary_section_cache: Optional[tuple] = None
+        # LRU of results keyed by (normalized message, mode), valid for the
+        # (vocabulary, structure) they were classified against
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_vault: Optional[tuple] = None
+        # (input, lookup tables) for the last domain list / vault structure
+        # validated against
+        self._domain_tables_cache: Optional[tuple] = None
+        self._subject_tables_cache: Optional[tuple] = None
+        # Runs the speculative PARA step of the pipeline (created on first use)
+        self._speculation_pool: Optional[ThreadPoolExecutor] = None
+        if preload:
+            threading.Thread(target=self._preload_models, daemon=True).start()
+    
+    def _preload_models(self):
+        """Load every model the current classification mode will call."""
+        if self._get_classification_mode() == "pipeline":
+            models = {self._get_model_for_step(step) for step in ("domain", "para", "subject_category")}
+        else:
+            models = {None}
+        for model in models:
+            self._ollama_client.preload(model)
     
+    def invalidate_cache(self):
+        """Drop cached SOP text, prompt sections, lookups and results (e.g. after editing docs/sop)."""
+        _read_sop.cache_clear()
+        self._vocabulary_section_cache = None
+        self._domain_tables_cache = None
+        self._subject_tables_cache = None
+        self._result_cache.clear()
+        self._result_cache_vault = None
+
     def _get_classification_mode(self) -> str:
         """Return 'single' or 'pipeline' from env (default: single)."""
         mode = (os.environ.get(CLASSIFICATION_MODE_ENV) or "single").strip().lower()
@@ -124,17 +269,185 @@ class MessageClassifier:
         """
         Classify a message into domain, PARA type, subject, and category.
 
-        Uses single-shot or pipeline mode based on CLASSIFICATION_MODE env.
+        Messages that name exactly one domain, one subject folder and one
+        category cue are classified by rule without an LLM call. Otherwise
+        uses single-shot or pipeline mode based on CLASSIFICATION_MODE env.
         """
+        vocabulary = self._vault_scanner.get_vocabulary()
+        structure = self._vault_scanner.get_structure()
+
+        # Repeated messages reuse the earlier result while the vault is unchanged
+        if self._result_cache_vault != (vocabulary, structure):
+            self._result_cache.clear()
+            self._result_cache_vault = (vocabulary, structure)
+        key = (" ".join(message.casefold().split()), self._get_classification_mode())
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            self._result_cache.move_to_end(key)
+            return cached
+
+        result = self._classify_uncached(message, vocabulary, structure)
+        self._result_cache[key] = result
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return result
+
+    def _classify_uncached(
+        self,
+        message: str,
+        vocabulary: Dict[str, List[str]],
+        structure: Dict[str, Dict[str, List[str]]]
+    ) -> ClassificationResult:
+        """Classify by rule if possible, else with the configured LLM mode."""
+        fast = self._fast_classify(message, vocabulary, structure)
+        if fast is not None:
+            return fast
+
         if self._get_classification_mode() == "pipeline":
             return self._classify_pipeline(message)
 
+        system = self._build_system_prompt(vocabulary, structure)
+        prompt = self._build_prompt(message)
+        valid_domains = vocabulary.get("domains", [DEFAULT_DOMAIN])
+        all_subjects = {
+            subject
+            for para_dict in structure.values()
+            for subjects in para_dict.values()
+            for subject in subjects
+        }
+        schema = _object_schema(
+            domain=_enum(valid_domains),
+            para_type=_enum(VALID_PARA_TYPES),
+            subject=_enum(sorted(all_subjects) + [DEFAULT_SUBJECT]),
+            category=_enum(VALID_CATEGORIES),
+            confidence=_CONFIDENCE_SCHEMA,
+            reasoning=_STRING_SCHEMA,
+        )
+        raw_response = self._chat(prompt, schema=schema, system=system)
+        return self._parse_response(raw_response, vocabulary, structure)
+
+    def classify_batch(self, messages: List[str]) -> List[ClassificationResult]:
+        """
+        Classify several messages with a single LLM call.
+
+        Rule-matched messages are left out of the call. Pipeline mode and
+        single pending messages go through classify(). Falls back to
+        per-message classify() if the model's reply can't be matched
+        one-to-one with the pending messages.
+
+        Returns:
+            One ClassificationResult per message, in input order
+        """
+        if len(messages) < 2 or self._get_classification_mode() == "pipeline":
+            return [self.classify(m) for m in messages]
+
         vocabulary = self._vault_scanner.get_vocabulary()
         structure = self._vault_scanner.get_structure()
-        prompt = self._build_prompt(message, vocabulary, structure)
-        response = self._ollama_client.chat([{"role": "user", "content": prompt}])
+        results = {}
+        for i, message in enumerate(messages):
+            fast = self._fast_classify(message, vocabulary, structure)
+            if fast is not None:
+                results[i] = fast
+        pending = [i for i in range(len(messages)) if i not in results]
+        if len(pending) < 2:
+            return [results[i] if i in results else self.classify(m) for i, m in enumerate(messages)]
+
+        system = self._build_system_prompt(vocabulary, structure)
+        prompt = self._build_batch_prompt([messages[i] for i in pending])
+        response = self._ollama_client.chat([
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt},
+        ])
         raw_response = response.get("message", {}).get("content", "")
-        return self._parse_response(raw_response, vocabulary, structure)
+        try:
+            items = _json_loads(raw_response[raw_response.find("["):raw_response.rfind("]") + 1])
+        except json.JSONDecodeError:
+            items = None
+        if (
+            not isinstance(items, list)
+            or len(items) != len(pending)
+            or not all(isinstance(item, dict) for item in items)
+        ):
+            return [results[i] if i in results else self.classify(m) for i, m in enumerate(messages)]
+        for i, item in zip(pending, items):
+            results[i] = self._result_from_parsed(item, vocabulary, structure, json.dumps(item))
+        return [results[i] for i in range(len(messages))]
+
+    def _chat(
+        self,
+        prompt: str,
+        schema: Dict,
+        model: Optional[str] = None,
+        system: Optional[str] = None
+    ) -> str:
+        """
+        Send one prompt (after an optional system message) and return the reply text.
+
+        The reply is constrained to schema (Ollama structured outputs). A
+        server that rejects format= as unsupported is asked again without
+        it, and the schema is not sent again by this classifier; any other
+        error is raised as usual. Reading stops once
+        the JSON object is complete, and generation is capped at
+        CLASSIFY_NUM_PREDICT tokens either way.
+        """
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        if self._structured_output:
+            try:
+                response = self._ollama_client.chat(
+                    messages, model=model, format=schema, options=_REPLY_OPTIONS, stop_after_json=True
+                )
+                return response.get("message", {}).get("content", "")
+            except OllamaFormatUnsupported:
+                self._structured_output = False
+        response = self._ollama_client.chat(
+            messages, model=model, options=_REPLY_OPTIONS, stop_after_json=True
+        )
+        return response.get("message", {}).get("content", "")
+
+    def _fast_classify(
+        self,
+        message: str,
+        vocabulary: Dict[str, List[str]],
+        structure: Dict[str, Dict[str, List[str]]]
+    ) -> Optional[ClassificationResult]:
+        """
+        Classify by rule when the message is unambiguous, else return None.
+
+        Needs exactly one category cue, exactly one domain named in the
+        message, and exactly one of that domain's subject folders named;
+        the PARA type is the folder's own.
+        """
+        categories = [category for category, pattern in _CATEGORY_CUES if pattern.search(message)]
+        if len(categories) != 1:
+            return None
+
+        text = message.casefold()
+        domain_patterns = self._domain_tables(vocabulary.get("domains", []))[2]
+        domains = [d for d, pattern in domain_patterns if pattern.search(text)]
+        if len(domains) != 1:
+            return None
+        domain = domains[0]
+
+        subject_patterns = self._subject_tables(structure)[3]
+        hits = [
+            (para, subject)
+            for para, subject, pattern in subject_patterns.get(domain, ())
+            if pattern.search(text)
+        ]
+        if len(hits) != 1:
+            return None
+        para_type, subject = hits[0]
+
+        return ClassificationResult(
+            domain=domain,
+            para_type=para_type,
+            subject=subject,
+            category=categories[0],
+            confidence=FAST_PATH_CONFIDENCE,
+            reasoning="rule match",
+        )
 
     def _classify_pipeline(self, message: str) -> ClassificationResult:
         """Run domain → para → subject+category pipeline and return combined result."""
@@ -144,6 +457,19 @@ class MessageClassifier:
         sop_text = _load_sop()
         sop_section = f"\nSOP (follow when classifying):\n{sop_text}\n" if sop_text else ""
 
+        # A message that names exactly one domain will almost always be
+        # classified into it, so ask for its PARA type while step 1 runs
+        text = message.casefold()
+        named = [d for d, pattern in self._domain_tables(valid_domains)[2] if pattern.search(text)]
+        speculative_domain = named[0] if len(named) == 1 else None
+        speculative = None
+        if speculative_domain is not None:
+            if self._speculation_pool is None:
+                self._speculation_pool = ThreadPoolExecutor(max_workers=1)
+            speculative = self._speculation_pool.submit(
+                self._para_step, message, speculative_domain, sop_section
+            )
+
         # Step 1: Domain only
         domain_prompt = f"""You classify messages into ONE domain. Domains: {", ".join(valid_domains)}.{sop_section}
 
@@ -152,8 +478,13 @@ MESSAGE: "{message}"
 Respond with ONLY this JSON: {{"domain": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
 domain MUST be one of: {", ".join(valid_domains)}."""
         model_domain = self._get_model_for_step("domain")
-        resp1 = self._ollama_client.chat([{"role": "user", "content": domain_prompt}], model=model_domain)
-        raw1 = resp1.get("message", {}).get("content", "")
+        raw1 = self._chat(
+            domain_prompt,
+            schema=_object_schema(
+                domain=_enum(valid_domains), confidence=_CONFIDENCE_SCHEMA, reasoning=_STRING_SCHEMA
+            ),
+            model=model_domain,
+        )
         domain, conf1, reason1 = self._parse_domain_step(raw1, valid_domains)
         if domain is None:
             domain = DEFAULT_DOMAIN
@@ -161,16 +492,10 @@ domain MUST be one of: {", ".join(valid_domains)}."""
             reason1 = "fallback default"
 
         # Step 2: PARA only (given domain)
-        para_prompt = f"""You classify messages into ONE PARA type. Message: "{message}". Domain (already chosen): {domain}.{sop_section}
-
-PARA Types: 1_Projects, 2_Areas, 3_Resources, 4_Archive.
-
-Respond with ONLY this JSON: {{"para_type": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
-para_type MUST be one of: 1_Projects, 2_Areas, 3_Resources, 4_Archive."""
-        model_para = self._get_model_for_step("para")
-        resp2 = self._ollama_client.chat([{"role": "user", "content": para_prompt}], model=model_para)
-        raw2 = resp2.get("message", {}).get("content", "")
-        para_type, conf2, reason2 = self._parse_para_step(raw2)
+        if speculative is not None and speculative_domain == domain:
+            para_type, conf2, reason2, raw2 = speculative.result()
+        else:
+            para_type, conf2, reason2, raw2 = self._para_step(message, domain, sop_section)
         if para_type is None:
             para_type = DEFAULT_PARA_TYPE
             conf2 = DEFAULT_CONFIDENCE
@@ -189,8 +514,17 @@ Categories: meeting, task, idea, reference, journal, question.
 
 Respond with ONLY this JSON: {{"subject": "...", "category": "...", "confidence": 0.0-1.0, "reasoning": "..."}}"""
         model_full = self._get_model_for_step("subject_category")
-        resp3 = self._ollama_client.chat([{"role": "user", "content": step3_prompt}], model=model_full)
-        raw3 = resp3.get("message", {}).get("content", "")
+        step3_subjects = sorted(set(subjects_for_domain)) + [DEFAULT_SUBJECT]
+        raw3 = self._chat(
+            step3_prompt,
+            schema=_object_schema(
+                subject=_enum(step3_subjects),
+                category=_enum(VALID_CATEGORIES),
+                confidence=_CONFIDENCE_SCHEMA,
+                reasoning=_STRING_SCHEMA,
+            ),
+            model=model_full,
+        )
         subject, category, conf3, reason3 = self._parse_subject_category_step(raw3, structure, domain, para_type)
         if subject is None:
             subject = DEFAULT_SUBJECT
@@ -213,6 +547,24 @@ Respond with ONLY this JSON: {{"subject": "...", "category": "...", "confidence"
             raw_response=f"domain: {raw1}\npara: {raw2}\nsubject_category: {raw3}",
         )
 
+    def _para_step(self, message: str, domain: str, sop_section: str) -> tuple:
+        """Run the PARA step for a chosen domain; return (para_type, confidence, reasoning, raw)."""
+        para_prompt = f"""You classify messages into ONE PARA type. Message: "{message}". Domain (already chosen): {domain}.{sop_section}
+
+PARA Types: 1_Projects, 2_Areas, 3_Resources, 4_Archive.
+
+Respond with ONLY this JSON: {{"para_type": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
+para_type MUST be one of: 1_Projects, 2_Areas, 3_Resources, 4_Archive."""
+        model_para = self._get_model_for_step("para")
+        raw = self._chat(
+            para_prompt,
+            schema=_object_schema(
+                para_type=_enum(VALID_PARA_TYPES), confidence=_CONFIDENCE_SCHEMA, reasoning=_STRING_SCHEMA
+            ),
+            model=model_para,
+        )
+        return self._parse_para_step(raw) + (raw,)
+
     def _parse_domain_step(self, raw: str, valid_domains: List[str]) -> tuple:
         """Parse domain step JSON; return (domain, confidence, reasoning)."""
         parsed = self._parse_json_single(raw)
@@ -248,22 +600,23 @@ Respond with ONLY this JSON: {{"subject": "...", "category": "...", "confidence"
 
     def _parse_json_single(self, raw: str) -> Optional[Dict]:
         """Extract single JSON object from raw response."""
-        try:
-            json_match = re.search(r"\{[^{}]*\}", raw, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-        return None
+        return _extract_json(raw)
 
-    def _build_prompt(
+    def _vocabulary_section(
         self,
-        message: str,
         vocabulary: Dict[str, List[str]],
         structure: Dict[str, Dict[str, List[str]]]
     ) -> str:
-        """Build the classification prompt."""
-        domains = ", ".join(vocabulary.get("domains", [DEFAULT_DOMAIN]))
+        """Build the vocabulary, subjects and SOP part shared by single and batch prompts."""
+        valid_domains = vocabulary.get("domains", [DEFAULT_DOMAIN])
+        sop_text = _load_sop()
+        # The scanner hands back fresh dicts each call; comparing them is
+        # much cheaper than re-sorting every subject list
+        key = (valid_domains, structure, sop_text)
+        cached = self._vocabulary_section_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        domains = ", ".join(valid_domains)
         
         # Build subjects by domain for context
         subjects_by_domain = []
@@ -274,33 +627,52 @@ Respond with ONLY this JSON: {{"subject": "...", "category": "...", "confidence"
             if all_subjects:
                 subjects_by_domain.append(f"  {domain}: {', '.join(sorted(set(all_subjects)))}")
         subjects_section = "\n".join(subjects_by_domain) if subjects_by_domain else "  (no subjects discovered)"
-        sop_text = _load_sop()
         sop_section = f"\nSOP (follow when classifying):\n{sop_text}\n" if sop_text else ""
 
-        return f"""You are a classification assistant for a personal knowledge management system.
-
-VOCABULARY (use ONLY these values):
+        section = f"""VOCABULARY (use ONLY these values):
 Domains: {domains}
 PARA Types: 1_Projects, 2_Areas, 3_Resources, 4_Archive
 Categories: meeting, task, idea, reference, journal, question
 
 SUBJECTS by domain:
 {subjects_section}
-{sop_section}
+{sop_section}"""
+        self._vocabulary_section_cache = (key, section)
+        return section
 
-MESSAGE TO CLASSIFY:
+    def _build_system_prompt(
+        self,
+        vocabulary: Dict[str, List[str]],
+        structure: Dict[str, Dict[str, List[str]]]
+    ) -> str:
+        """
+        Build the system message shared by single and batch classification.
+
+        Holds everything that doesn't depend on the message so Ollama can
+        reuse the cached prefix across calls.
+        """
+        return f"""You are a classification assistant for a personal knowledge management system.
+
+{self._vocabulary_section(vocabulary, structure)}
+
+{CLASSIFICATION_RULES}"""
+
+    def _build_prompt(self, message: str) -> str:
+        """Build the per-message part of the classification prompt."""
+        return f"""MESSAGE TO CLASSIFY:
 "{message}"
 
 Respond with ONLY this JSON (no other text):
-{{"domain": "...", "para_type": "...", "subject": "...", "category": "...", "confidence": 0.0-1.0, "reasoning": "..."}}
+{{"domain": "...", "para_type": "...", "subject": "...", "category": "...", "confidence": 0.0-1.0, "reasoning": "..."}}"""
 
-RULES:
-- domain MUST be one from the Domains list
-- para_type MUST be one from PARA Types
-- subject should be from the domain's subjects, or "general" if none fit
-- category MUST be one from Categories
-- confidence between 0.0 and 1.0 based on certainty
-- reasoning should be a brief explanation"""
+    def _build_batch_prompt(self, messages: List[str]) -> str:
+        """Build the per-call part of a prompt classifying several messages."""
+        numbered = "\n".join(f'{n}. "{message}"' for n, message in enumerate(messages, 1))
+        return f"""MESSAGES TO CLASSIFY:
+{numbered}
+
+Respond with ONLY a JSON array of exactly {len(messages)} objects, one per message in the same order (no other text):
+[{{"domain": "...", "para_type": "...", "subject": "...", "category": "...", "confidence": 0.0-1.0, "reasoning": "..."}}, ...]"""
     
     def _parse_response(
         self,
@@ -309,20 +681,23 @@ RULES:
         structure: Dict[str, Dict[str, List[str]]]
     ) -> ClassificationResult:
         """Parse LLM response and validate fields."""
-        # Try JSON parse first
-        parsed = None
-        try:
-            # Try to find JSON in the response (handle extra text)
-            json_match = re.search(r'\{[^{}]*\}', raw_response, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
+        # Try JSON parse first (handles extra text around the object)
+        parsed = _extract_json(raw_response)
         
         # Fallback to regex extraction if JSON fails
         if parsed is None:
             parsed = self._extract_with_regex(raw_response)
         
+        return self._result_from_parsed(parsed, vocabulary, structure, raw_response)
+    
+    def _result_from_parsed(
+        self,
+        parsed: Dict,
+        vocabulary: Dict[str, List[str]],
+        structure: Dict[str, Dict[str, List[str]]],
+        raw_response: str
+    ) -> ClassificationResult:
+        """Validate the fields of one parsed response into a result."""
         # Validate and normalize each field
         valid_domains = vocabulary.get("domains", [DEFAULT_DOMAIN])
         
@@ -348,17 +723,8 @@ RULES:
         result = {}
         
         # Try to extract each field
-        patterns = {
-            "domain": r'"domain"\s*:\s*"([^"]+)"',
-            "para_type": r'"para_type"\s*:\s*"([^"]+)"',
-            "subject": r'"subject"\s*:\s*"([^"]+)"',
-            "category": r'"category"\s*:\s*"([^"]+)"',
-            "confidence": r'"confidence"\s*:\s*([0-9.]+)',
-            "reasoning": r'"reasoning"\s*:\s*"([^"]+)"',
-        }
-        
-        for field, pattern in patterns.items():
-            match = re.search(pattern, raw_response)
+        for field, pattern in _FIELD_PATTERNS:
+            match = pattern.search(raw_response)
             if match:
                 value = match.group(1)
                 if field == "confidence":
@@ -375,33 +741,59 @@ RULES:
         if not domain:
             return DEFAULT_DOMAIN
         
+        exact, candidates, _ = self._domain_tables(valid_domains)
+        
         # Case-insensitive match
-        domain_lower = domain.lower()
-        for valid in valid_domains:
-            if valid.lower() == domain_lower:
-                return valid
+        domain_lower = domain.casefold()
+        match = exact.get(domain_lower)
+        if match is not None:
+            return match
         
         # Check for partial match
-        for valid in valid_domains:
-            if domain_lower in valid.lower() or valid.lower() in domain_lower:
+        for valid_lower, valid in candidates:
+            if domain_lower in valid_lower or valid_lower in domain_lower:
                 return valid
         
         return DEFAULT_DOMAIN
     
+    def _domain_tables(self, valid_domains: List[str]) -> tuple:
+        """
+        Casefolded lookup tables for valid_domains, rebuilt only when it changes.
+        
+        Returns:
+            (casefolded domain -> domain, [(casefolded, domain)],
+            [(domain, whole-word pattern)] for spotting domains in messages)
+        """
+        cached = self._domain_tables_cache
+        if cached is not None and cached[0] == valid_domains:
+            return cached[1]
+        candidates = [(valid.casefold(), valid) for valid in valid_domains]
+        exact = {}
+        for valid_lower, valid in candidates:
+            exact.setdefault(valid_lower, valid)
+        patterns = []
+        for valid in valid_domains:
+            pattern = _term_pattern(valid)
+            if pattern is not None:
+                patterns.append((valid, pattern))
+        tables = (exact, candidates, patterns)
+        self._domain_tables_cache = (list(valid_domains), tables)
+        return tables
+    
     def _validate_para(self, para_type: str) -> str:
         """Validate PARA type."""
         if not para_type:
             return DEFAULT_PARA_TYPE
         
         # Case-insensitive match
-        para_lower = para_type.lower()
-        for valid in VALID_PARA_TYPES:
-            if valid.lower() == para_lower:
-                return valid
+        para_lower = para_type.casefold()
+        match = _PARA_TYPE_MAP.get(para_lower)
+        if match is not None:
+            return match
         
         # Check for partial match (e.g., "Projects" -> "1_Projects")
-        for valid in VALID_PARA_TYPES:
-            if para_lower in valid.lower() or valid.lower().split("_")[-1] in para_lower:
+        for valid_lower, suffix, valid in _PARA_TYPE_PARTIALS:
+            if para_lower in valid_lower or suffix in para_lower:
                 return valid
         
         return DEFAULT_PARA_TYPE
@@ -414,44 +806,60 @@ RULES:
         para_type: str
     ) -> str:
         """Validate subject against vault structure."""
-        if not subject or subject.lower() == "general":
+        subject_lower = subject.casefold() if subject else ""
+        if not subject_lower or subject_lower == DEFAULT_SUBJECT:
             return DEFAULT_SUBJECT
         
-        subject_lower = subject.lower()
-        
-        # First, check if subject exists in the specific domain/para
-        if domain in structure and para_type in structure[domain]:
-            for valid in structure[domain][para_type]:
-                if valid.lower() == subject_lower:
-                    return valid
+        by_para, by_domain, anywhere, _ = self._subject_tables(structure)
         
-        # Then check if subject exists anywhere in the domain
-        if domain in structure:
-            for para_dict in structure[domain].values():
-                for valid in para_dict:
-                    if valid.lower() == subject_lower:
-                        return valid
-        
-        # Finally check if subject exists anywhere
-        for domain_dict in structure.values():
-            for para_dict in domain_dict.values():
-                for valid in para_dict:
-                    if valid.lower() == subject_lower:
-                        return valid
+        # First, check if subject exists in the specific domain/para, then
+        # anywhere in the domain, then anywhere at all
+        match = by_para.get((domain, para_type), {}).get(subject_lower)
+        if match is None:
+            match = by_domain.get(domain, {}).get(subject_lower)
+        if match is None:
+            match = anywhere.get(subject_lower)
+        return match if match is not None else DEFAULT_SUBJECT
+    
+    def _subject_tables(self, structure: Dict[str, Dict[str, List[str]]]) -> tuple:
+        """
+        Casefolded subject lookups for structure, rebuilt only when it changes.
         
-        return DEFAULT_SUBJECT
+        Returns:
+            (by (domain, para), by domain, anywhere) dicts of
+            casefolded subject -> subject, where the first occurrence wins,
+            and domain -> [(para, subject, whole-word pattern)]
+        """
+        cached = self._subject_tables_cache
+        if cached is not None and cached[0] == structure:
+            return cached[1]
+        by_para = {}
+        by_domain = {}
+        anywhere = {}
+        patterns = {}
+        for domain, para_dict in structure.items():
+            domain_map = by_domain.setdefault(domain, {})
+            domain_patterns = patterns.setdefault(domain, [])
+            for para, subjects in para_dict.items():
+                para_map = by_para.setdefault((domain, para), {})
+                for valid in subjects:
+                    valid_lower = valid.casefold()
+                    para_map.setdefault(valid_lower, valid)
+                    domain_map.setdefault(valid_lower, valid)
+                    anywhere.setdefault(valid_lower, valid)
+                    pattern = _term_pattern(valid)
+                    if pattern is not None:
+                        domain_patterns.append((para, valid, pattern))
+        tables = (by_para, by_domain, anywhere, patterns)
+        self._subject_tables_cache = (structure, tables)
+        return tables
     
     def _validate_category(self, category: str) -> str:
         """Validate category."""
         if not category:
             return DEFAULT_CATEGORY
         
-        category_lower = category.lower()
-        for valid in VALID_CATEGORIES:
-            if valid.lower() == category_lower:
-                return valid
-        
-        return DEFAULT_CATEGORY
+        return _CATEGORY_MAP.get(category.casefold(), DEFAULT_CATEGORY)
     
     def _validate_confidence(self, confidence) -> float:
         """Validate and clamp confidence to 0.0-1.0."""
@@ -477,6 +885,20 @@ def classify_message(message: str) -> ClassificationResult:
     return classifier.classify(message)
 
 
+def classify_message_batch(messages: List[str]) -> List[ClassificationResult]:
+    """
+    Classify several messages with one LLM call using default clients.
+    
+    Args:
+        messages: Message texts to classify
+        
+    Returns:
+        One ClassificationResult per message, in input order
+    """
+    classifier = MessageClassifier()
+    return classifier.classify_batch(messages)
+
+
 def get_classifier() -> MessageClassifier:
     """Get a configured MessageClassifier instance."""
     return MessageClassifier()
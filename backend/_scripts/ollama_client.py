@@ -7,8 +7,10 @@ with comprehensive error handling.
 """
 
 from dataclasses import dataclass
-from typing import Optional
+import json
+from typing import Optional, Union
 import os
+import threading
 
 from ollama import Client, ResponseError
 import httpx
@@ -19,6 +21,8 @@ DEFAULT_HOST = "http://localhost:11434"
 DEFAULT_MODEL = "llama3.2:latest"
 DEFAULT_TIMEOUT = 30.0  # Cold start can take 20s+
 HEALTH_CHECK_TIMEOUT = 5.0  # Quick health checks
+DEFAULT_KEEP_ALIVE = "30m"  # Keep weights loaded between polls (server default is 5m)
+MAX_KEEPALIVE_CONNECTIONS = 16
 
 
 # Custom exceptions
@@ -42,6 +46,78 @@ class OllamaTimeout(OllamaError):
     pass
 
 
+class OllamaFormatUnsupported(OllamaError):
+    """Server rejected the format= (structured output) parameter."""
+    pass
+
+
+def _read_until_json_object(chunks) -> str:
+    """
+    Join streamed chat chunks until the first JSON object is complete.
+
+    Closes the stream at that point so trailing text is never generated.
+    Braces inside strings are skipped, and a balanced span that isn't
+    valid JSON (e.g. "{draft}" in prose) doesn't end the read.
+    """
+    text = ""
+    depth = 0
+    start = 0
+    in_string = False
+    escaped = False
+    try:
+        for chunk in chunks:
+            piece = chunk["message"]["content"] or ""
+            offset = len(text)
+            text += piece
+            for i, ch in enumerate(piece, offset):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"' and depth:
+                    in_string = True
+                elif ch == "{":
+                    if not depth:
+                        start = i
+                    depth += 1
+                elif ch == "}" and depth:
+                    depth -= 1
+                    if not depth:
+                        try:
+                            json.loads(text[start:i + 1])
+                        except ValueError:
+                            continue
+                        return text[:i + 1]
+        return text
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+_transport: Optional[httpx.HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def _shared_transport() -> httpx.HTTPTransport:
+    """
+    Connection pool shared by every client in the process.
+
+    Health checks, chat calls and separate OllamaClient instances then reuse
+    the same keep-alive connections instead of each opening their own.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = httpx.HTTPTransport(
+                limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+            )
+        return _transport
+
+
 @dataclass
 class HealthStatus:
     """Ollama health check result."""
@@ -76,7 +152,8 @@ class OllamaClient:
         self,
         host: str = None,
         model: str = None,
-        timeout: float = DEFAULT_TIMEOUT
+        timeout: float = DEFAULT_TIMEOUT,
+        keep_alive: str = None
     ):
         """
         Initialize Ollama client.
@@ -85,10 +162,13 @@ class OllamaClient:
             host: Ollama server URL (default: http://localhost:11434)
             model: Model to use for chat/generate (default: llama3.2:3b)
             timeout: Request timeout in seconds (default: 30.0)
+            keep_alive: How long the server keeps the model loaded after a
+                request (default: OLLAMA_KEEP_ALIVE env or 30m)
         """
         self.host = host or os.environ.get("OLLAMA_HOST", DEFAULT_HOST)
         self.model = model or os.environ.get("OLLAMA_MODEL", DEFAULT_MODEL)
         self.timeout = timeout
+        self.keep_alive = keep_alive or os.environ.get("OLLAMA_KEEP_ALIVE", DEFAULT_KEEP_ALIVE)
         self._client: Optional[Client] = None
         self._health_client: Optional[Client] = None
     
@@ -96,14 +176,18 @@ class OllamaClient:
     def client(self) -> Client:
         """Get client for LLM operations (longer timeout)."""
         if self._client is None:
-            self._client = Client(host=self.host, timeout=self.timeout)
+            self._client = Client(
+                host=self.host, timeout=self.timeout, transport=_shared_transport()
+            )
         return self._client
     
     @property
     def health_client(self) -> Client:
         """Get client for health checks (shorter timeout)."""
         if self._health_client is None:
-            self._health_client = Client(host=self.host, timeout=HEALTH_CHECK_TIMEOUT)
+            self._health_client = Client(
+                host=self.host, timeout=HEALTH_CHECK_TIMEOUT, transport=_shared_transport()
+            )
         return self._health_client
     
     def is_server_running(self) -> bool:
@@ -165,7 +249,15 @@ class OllamaClient:
         status.ready = True
         return status
     
-    def chat(self, messages: list[dict], stream: bool = False, model: Optional[str] = None) -> dict:
+    def chat(
+        self,
+        messages: list[dict],
+        stream: bool = False,
+        model: Optional[str] = None,
+        format: Optional[Union[str, dict]] = None,
+        options: Optional[dict] = None,
+        stop_after_json: bool = False
+    ) -> dict:
         """
         Send chat messages to model.
 
@@ -173,6 +265,10 @@ class OllamaClient:
             messages: List of {"role": "user"|"assistant"|"system", "content": "..."}
             stream: If True, return iterator for streaming responses
             model: Override model for this call (default: use instance model)
+            format: "json" or a JSON schema the reply must conform to
+            options: Model options for this call (e.g. {"num_predict": 256})
+            stop_after_json: Stream the reply and stop reading as soon as
+                the first JSON object in it is complete
 
         Returns:
             Response dict with "message" containing model's reply.
@@ -181,13 +277,32 @@ class OllamaClient:
             OllamaServerNotRunning: Server not reachable
             OllamaModelNotFound: Model not downloaded
             OllamaTimeout: Request timed out
+            OllamaFormatUnsupported: Server doesn't accept this format
             OllamaError: Other errors
         """
         try:
+            if stop_after_json and not stream:
+                chunks = self.client.chat(
+                    model=model or self.model,
+                    messages=messages,
+                    stream=True,
+                    format=format,
+                    options=options,
+                    keep_alive=self.keep_alive
+                )
+                return {
+                    "message": {
+                        "content": _read_until_json_object(chunks),
+                        "role": "assistant"
+                    }
+                }
             response = self.client.chat(
                 model=model or self.model,
                 messages=messages,
-                stream=stream
+                stream=stream,
+                format=format,
+                options=options,
+                keep_alive=self.keep_alive
             )
             # Convert response object to dict for consistency
             if hasattr(response, 'message'):
@@ -212,6 +327,8 @@ class OllamaClient:
                 raise OllamaModelNotFound(
                     f"Model '{self.model}' not found. Run: ollama pull {self.model}"
                 ) from e
+            if format is not None and e.status_code == 400 and "format" in str(e.error).lower():
+                raise OllamaFormatUnsupported(f"Ollama API error: {e.error}") from e
             raise OllamaError(f"Ollama API error: {e.error}") from e
         except Exception as e:
             raise OllamaError(f"Unexpected error: {e}") from e
@@ -231,7 +348,8 @@ class OllamaClient:
             response = self.client.generate(
                 model=self.model,
                 prompt=prompt,
-                stream=stream
+                stream=stream,
+                keep_alive=self.keep_alive
             )
             # Convert response object to dict for consistency
             if hasattr(response, 'response'):
@@ -254,6 +372,26 @@ class OllamaClient:
         except Exception as e:
             raise OllamaError(f"Unexpected error: {e}") from e
     
+    def preload(self, model: Optional[str] = None) -> bool:
+        """
+        Load a model into memory without generating anything.
+        
+        An empty prompt makes the server load the weights and hold them
+        for keep_alive, so the next real request skips the cold start.
+        
+        Returns:
+            True if the server accepted the request, False otherwise.
+        """
+        try:
+            self.client.generate(
+                model=model or self.model,
+                prompt="",
+                keep_alive=self.keep_alive
+            )
+            return True
+        except Exception:
+            return False
+    
     def verify_model_responds(self) -> bool:
         """
         Verify model can generate a response.
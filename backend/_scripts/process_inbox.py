@@ -51,6 +51,12 @@ FAILURE_ALERT_THRESHOLD = 3
 VAULT_PATH = Path.home() / "PARA"
 LAST_TS_FILE = Path(__file__).parent / ".state" / ".last_processed_ts"
 
+# Command prefixes handled by status_handler.py
+_STATUS_COMMANDS = frozenset(("done", "progress", "blocked", "backlog"))
+
+# Newest message ts handled this run; persisted once by _flush_last_ts()
+_pending_last_ts: Optional[str] = None
+
 # Lazy-initialized classifier
 _classifier: Optional[MessageClassifier] = None
 
@@ -89,6 +95,19 @@ def fetch_new_messages():
     return fetch_messages(oldest=last_ts)
 
 
+def _flush_last_ts() -> None:
+    """Atomically persist the newest processed ts, if any, to LAST_TS_FILE."""
+    global _pending_last_ts
+    if _pending_last_ts is None:
+        return
+
+    LAST_TS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = LAST_TS_FILE.with_name(LAST_TS_FILE.name + ".tmp")
+    temp_path.write_text(_pending_last_ts)
+    os.replace(temp_path, LAST_TS_FILE)
+    _pending_last_ts = None
+
+
 def _process_attachments(msg: dict, filepath: Path) -> None:
     """
     Download Slack message attachments to the note's folder and append markdown links.
@@ -122,16 +141,16 @@ def process_message(msg: dict) -> bool:
 
     Returns True if successful, False if failed (logged to dead letter).
     """
+    global _pending_last_ts
     text = msg["text"]
     ts = msg["ts"]
-    timestamp = datetime.fromtimestamp(float(ts)).isoformat()
 
     # Skip fix: commands - handled by fix_handler.py
-    if text.lower().startswith("fix:"):
+    if text[:4].lower() == "fix:":
         return True  # Not a failure, just skipped
 
     # Skip status commands (done:, progress:, etc.)
-    if text.lower().split(":")[0] in ["done", "progress", "blocked", "backlog"]:
+    if text.partition(":")[0].lower() in _STATUS_COMMANDS:
         return True  # Handled by status_handler.py
 
     # Idempotency check - skip already processed messages
@@ -208,9 +227,8 @@ def process_message(msg: dict) -> bool:
         # Mark message as processed (prevents duplicate processing)
         mark_message_processed(ts)
 
-        # Update last processed timestamp
-        LAST_TS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        LAST_TS_FILE.write_text(ts)
+        # Update last processed timestamp (written once per run by process_all)
+        _pending_last_ts = ts
 
         return True
 
@@ -242,11 +260,15 @@ def process_all():
         processed_count = 0
         failed_count = 0
 
-        for msg in reversed(messages):  # Process oldest first
-            if process_message(msg):
-                processed_count += 1
-            else:
-                failed_count += 1
+        try:
+            for msg in reversed(messages):  # Process oldest first
+                if process_message(msg):
+                    processed_count += 1
+                else:
+                    failed_count += 1
+        finally:
+            # Persist progress even if the loop is interrupted
+            _flush_last_ts()
 
         # Periodically clean up old processed message entries
         cleanup_old_processed_messages()
@@ -9,9 +9,21 @@ from malformed or unexpected data.
 import re
 from typing import Optional
 
+# orjson is optional; its JSONDecodeError subclasses json's
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 # Valid destinations
 VALID_DESTINATIONS = {"people", "projects", "ideas", "admin"}
 
+# sanitize_filename: separators become hyphens, then anything outside
+# [a-z0-9-] is dropped and hyphen runs collapsed
+_SANITIZE_TABLE = str.maketrans({"/": "-", "\\": "-", " ": "-", "_": "-"})
+_INVALID_CHARS_RE = re.compile(r"[^a-z0-9-]")
+_DASH_RUN_RE = re.compile(r"-+")
+
 
 class ValidationError(Exception):
     """Raised when classification validation fails."""
@@ -126,21 +138,18 @@ def sanitize_filename(filename: str) -> str:
     - Replaces invalid characters with hyphens
     - Collapses multiple hyphens
     """
-    # Remove any path components
-    filename = filename.replace("/", "-").replace("\\", "-")
+    # Remove path components; spaces and underscores become hyphens too
+    filename = filename.translate(_SANITIZE_TABLE)
     filename = filename.replace("..", "-")
 
     # Convert to lowercase
     filename = filename.lower()
 
-    # Replace spaces and underscores with hyphens
-    filename = filename.replace(" ", "-").replace("_", "-")
-
     # Remove any characters that aren't alphanumeric or hyphens
-    filename = re.sub(r"[^a-z0-9-]", "", filename)
+    filename = _INVALID_CHARS_RE.sub("", filename)
 
     # Collapse multiple hyphens
-    filename = re.sub(r"-+", "-", filename)
+    filename = _DASH_RUN_RE.sub("-", filename)
 
     # Remove leading/trailing hyphens
     filename = filename.strip("-")
@@ -197,12 +206,10 @@ def parse_and_validate_classification(json_str: str) -> dict:
         Returns fallback classification if parsing/validation fails
         (does not raise - caller should check confidence)
     """
-    import json
-
     try:
-        data = json.loads(json_str)
+        data = _json.loads(json_str)
         return validate_classification(data)
-    except json.JSONDecodeError as e:
+    except _json.JSONDecodeError as e:
         return create_fallback_classification(
             json_str[:100],
             error=f"JSON parse error: {e}"
@@ -8,6 +8,7 @@ import os
 import time
 import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from typing import List, Optional
 
 # Retry configuration
@@ -15,6 +16,12 @@ MAX_RETRIES = 3
 INITIAL_BACKOFF = 1.0  # seconds
 MAX_BACKOFF = 30.0  # seconds
 
+# Connection pool size (matches the max concurrent callers, e.g. fix_handler)
+POOL_SIZE = 8
+
+# Shared session so repeated calls reuse TCP+TLS connections (keep-alive)
+_session: Optional[requests.Session] = None
+
 
 class SlackAPIError(Exception):
     """Raised when Slack API returns an error."""
@@ -47,6 +54,17 @@ def _get_channel_id() -> str:
     return channel_id
 
 
+def _get_session() -> requests.Session:
+    """Get the shared pooled HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
 def _request_with_retry(
     method: str,
     url: str,
@@ -65,13 +83,14 @@ def _request_with_retry(
     """
     backoff = INITIAL_BACKOFF
     last_exception = None
+    session = _get_session()
 
     for attempt in range(retries + 1):
         try:
             if method.upper() == "GET":
-                resp = requests.get(url, headers=headers, timeout=30, **kwargs)
+                resp = session.get(url, headers=headers, timeout=30, **kwargs)
             else:
-                resp = requests.post(url, headers=headers, timeout=30, **kwargs)
+                resp = session.post(url, headers=headers, timeout=30, **kwargs)
 
             # Handle rate limiting
             if resp.status_code == 429:
@@ -60,6 +60,28 @@ def _atomic_json_write(filepath: Path, data: dict):
 
 MESSAGE_MAPPING_FILE = STATE_DIR / "message_mapping.json"
 
+# (file identity, parsed mapping); writes replace the file via rename, so a
+# new inode/mtime/size means the cached copy is stale
+_mapping_cache: tuple = (None, {})
+
+
+def _read_message_mapping() -> dict:
+    """
+    Read the message mapping, reusing the parsed copy while the file is unchanged.
+
+    Callers must not mutate the returned dict.
+    """
+    global _mapping_cache
+    try:
+        st = MESSAGE_MAPPING_FILE.stat()
+    except FileNotFoundError:
+        return {}
+
+    key = (str(MESSAGE_MAPPING_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+    if _mapping_cache[0] != key:
+        _mapping_cache = (key, _atomic_json_read(MESSAGE_MAPPING_FILE))
+    return _mapping_cache[1]
+
 
 def get_file_for_message(message_ts: str) -> Optional[Path]:
     """
@@ -67,7 +89,7 @@ def get_file_for_message(message_ts: str) -> Optional[Path]:
 
     Returns None if message hasn't been processed.
     """
-    mapping = _atomic_json_read(MESSAGE_MAPPING_FILE)
+    mapping = _read_message_mapping()
     filepath_str = mapping.get(message_ts)
 
     if filepath_str:
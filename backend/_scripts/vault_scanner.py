@@ -31,6 +31,9 @@ CACHE_FILE = STATE_DIR / "vault_cache.json"
 DEFAULT_TTL_HOURS = 6
 CACHE_VERSION = 1
 
+# (path, inode, mtime, size) of the cache file last parsed, and its contents
+_cache_file_memo: tuple = (None, None)
+
 
 class VaultScanner:
     """
@@ -65,6 +68,8 @@ class VaultScanner:
         """
         self.vault_path = vault_path
         self.ttl_hours = ttl_hours
+        # (structure, vocabulary) from the last get_vocabulary() call
+        self._vocabulary_memo: tuple = (None, None)
     
     def scan(self) -> Dict[str, Dict[str, List[str]]]:
         """
@@ -149,14 +154,27 @@ class VaultScanner:
         """
         Load cache if valid and not expired.
         
+        The parsed file is reused while it is unchanged on disk, so callers
+        must not mutate the returned structure.
+        
         Returns:
             Cached structure dict, or None if cache is invalid/expired
         """
+        global _cache_file_memo
         try:
-            if not CACHE_FILE.exists():
+            try:
+                st = CACHE_FILE.stat()
+            except FileNotFoundError:
                 return None
             
-            cache_data = json.loads(CACHE_FILE.read_text())
+            # Classification reads the structure for every message; only
+            # re-parse the file when it has been rewritten
+            key = (str(CACHE_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+            if _cache_file_memo[0] == key:
+                cache_data = _cache_file_memo[1]
+            else:
+                cache_data = json.loads(CACHE_FILE.read_text())
+                _cache_file_memo = (key, cache_data)
             
             # Validate required fields
             if "cached_at" not in cache_data or "structure" not in cache_data:
@@ -187,6 +205,7 @@ class VaultScanner:
         Args:
             structure: Vault structure dict to cache
         """
+        global _cache_file_memo
         # Ensure state dir exists
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
         
@@ -210,6 +229,11 @@ class VaultScanner:
             
             temp_path.rename(CACHE_FILE)
             
+            # What we just wrote is what the next load would parse
+            st = CACHE_FILE.stat()
+            key = (str(CACHE_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+            _cache_file_memo = (key, cache_data)
+            
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
     
@@ -259,6 +283,8 @@ class VaultScanner:
             }
         """
         structure = self.get_structure()
+        if self._vocabulary_memo[0] is structure:
+            return self._vocabulary_memo[1]
         
         domains = set()
         para_types = set()
@@ -270,11 +296,13 @@ class VaultScanner:
                 para_types.add(para_name)
                 subjects.update(subject_list)
         
-        return {
+        vocabulary = {
             "domains": sorted(domains),
             "para_types": sorted(para_types),
             "subjects": sorted(subjects)
         }
+        self._vocabulary_memo = (structure, vocabulary)
+        return vocabulary
 
 
 # -----------------------------------------------------------------------------
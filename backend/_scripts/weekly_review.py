@@ -4,32 +4,60 @@
 # This script is retained for reference but is no longer actively maintained.
 """Generate weekly review from Obsidian vault, send to Slack DM."""
 
+import os
+import re
+from collections import Counter
 from pathlib import Path
-from datetime import datetime, timedelta
-import yaml
+from datetime import date, datetime, timedelta
+
+# Shared note frontmatter reader
+from frontmatter import load_frontmatter
 
 # Use shared Slack client with retry logic
 from slack_client import send_dm
 
 VAULT_PATH = Path.home() / "SecondBrain"
 
+# Capture counts reported by the review, in display order
+STAT_KEYS = ("people", "projects", "ideas", "admin", "review")
+
+
+# Inbox-log table row: | HH:MM | original | destination | ...
+# Captures the destination; header and separator rows have no HH:MM
+_ROW_RE = re.compile(r"^\|\s*\d\d:\d\d\s*\|[^|]*\|\s*([^|]+?)\s*\|", re.M)
+
+
+def _log_destinations(log_text):
+    """Yield the normalized destination of each inbox-log table row."""
+    for match in _ROW_RE.finditer(log_text):
+        dest = match.group(1).lower()
+        if "review" in dest:
+            yield "review"
+        elif dest in STAT_KEYS:
+            yield dest
+
 
 def gather_week_data():
     """Collect all items from past 7 days."""
-    week_ago = datetime.now() - timedelta(days=7)
+    # Log dates are whole days; keep those after the cutoff day
+    cutoff = (datetime.now() - timedelta(days=7)).date().isoformat()
     
-    # Read inbox logs from past week
-    inbox_logs = []
+    # Count items by type from the past week's inbox logs, one file at a time
+    stats = Counter(dict.fromkeys(STAT_KEYS, 0))
     log_dir = VAULT_PATH / "_inbox_log"
     if log_dir.exists():
-        for log_file in log_dir.glob("*.md"):
-            try:
-                date_str = log_file.stem
-                log_date = datetime.strptime(date_str, "%Y-%m-%d")
-                if log_date >= week_ago:
-                    inbox_logs.append(log_file.read_text())
-            except (ValueError, Exception) as e:
-                print(f"Error reading log {log_file}: {e}")
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                date_str = entry.name[:-3]
+                # YYYY-MM-DD sorts lexically, so old logs are skipped unparsed
+                if not entry.name.endswith(".md") or date_str <= cutoff:
+                    continue
+                try:
+                    date.fromisoformat(date_str)  # rejects FAILED-*.md etc.
+                    with open(entry.path) as fh:
+                        stats.update(_log_destinations(fh.read()))
+                except (ValueError, Exception) as e:
+                    print(f"Error reading log {entry.path}: {e}")
     
     # Gather all active projects
     projects = []
@@ -37,30 +65,13 @@ def gather_week_data():
     if projects_dir.exists():
         for f in projects_dir.glob("*.md"):
             try:
-                content = f.read_text()
-                if "---" in content:
-                    parts = content.split("---")
-                    if len(parts) >= 2:
-                        fm = yaml.safe_load(parts[1])
-                        if fm:
-                            projects.append(fm)
+                fm = load_frontmatter(f)
+                if fm:
+                    projects.append(fm)
             except Exception as e:
                 print(f"Error reading {f}: {e}")
     
-    # Count items by type from logs
-    stats = {"people": 0, "projects": 0, "ideas": 0, "admin": 0, "review": 0}
-    for log_text in inbox_logs:
-        for line in log_text.split("\n"):
-            if "|" in line and "Destination" not in line:
-                parts = [p.strip() for p in line.split("|")]
-                if len(parts) >= 4:
-                    dest = parts[3].lower()
-                    if "review" in dest:
-                        stats["review"] += 1
-                    elif dest in stats:
-                        stats[dest] += 1
-    
-    return inbox_logs, projects, stats
+    return projects, dict(stats)
 
 
 REVIEW_PROMPT = """
@@ -82,7 +93,7 @@ Keep it reflective and actionable.
 """
 
 
-def generate_review(inbox_logs, projects, stats):
+def generate_review(projects, stats):
     """
     Generate review text. In practice, Claude Code would call Claude API here.
     """
@@ -119,9 +130,9 @@ def generate_review(inbox_logs, projects, stats):
 
 def main():
     """Main review generation."""
-    inbox_logs, projects, stats = gather_week_data()
+    projects, stats = gather_week_data()
     
-    review_text = generate_review(inbox_logs, projects, stats)
+    review_text = generate_review(projects, stats)
     
     # In actual use, Claude Code would call Claude API with REVIEW_PROMPT
     
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Optional YouTube ingest dependency checks.
+
+Shared by health_check (cron) and the menu bar app so both use one
+cached enable flag and one cache of located tools.
+"""
+
+import functools
+import os
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Tool paths found so far, keyed by (name, PATH); misses are re-probed so
+# a tool installed while the menu bar app is running is picked up
+_found_executables: dict = {}
+
+
+@functools.lru_cache(maxsize=1)
+def is_enabled() -> bool:
+    """Whether YouTube dependency checks are turned on via the environment."""
+    # The environment is fixed for the life of the process
+    value = (os.environ.get("YOUTUBE_INGEST_ENABLED") or os.environ.get("CHECK_YOUTUBE_DEPS") or "").strip().lower()
+    return value in _TRUTHY
+
+
+def find_executables(names) -> dict:
+    """
+    Locate several executables with a single walk over PATH.
+
+    Returns:
+        Dict mapping each name to its full path, or None if not found.
+    """
+    path = os.environ.get("PATH", os.defpath)
+    result = {}
+    missing = []
+    for name in names:
+        result[name] = _found_executables.get((name, path))
+        if result[name] is None:
+            missing.append(name)
+
+    for directory in path.split(os.pathsep):
+        if not missing:
+            break
+        for name in list(missing):
+            candidate = os.path.join(directory, name)
+            if os.access(candidate, os.X_OK) and not os.path.isdir(candidate):
+                result[name] = _found_executables[(name, path)] = candidate
+                missing.remove(name)
+    return result
+
+
+def missing_dependencies() -> list[str]:
+    """
+    Describe YouTube ingest tools that are not installed.
+
+    whisper is only required when YOUTUBE_TRANSCRIPT_MODE=whisper.
+    """
+    issues = []
+    mode = (os.environ.get("YOUTUBE_TRANSCRIPT_MODE") or "").strip().lower()
+    found = find_executables(("yt-dlp", "ffmpeg", "whisper") if mode == "whisper" else ("yt-dlp", "ffmpeg"))
+    if found["yt-dlp"] is None:
+        issues.append("yt-dlp not found")
+    if found["ffmpeg"] is None:
+        issues.append("ffmpeg not found")
+    if mode == "whisper" and found["whisper"] is None:
+        issues.append("whisper not found (required for whisper mode)")
+    return issues
@@ -242,6 +242,16 @@ class TestDomainClassifier:
         assert "Just-Value" in prompt_content
         assert "CCBH" in prompt_content
 
+    def test_vocabulary_read_once_across_classifications(self, mock_ollama, mock_scanner):
+        """Repeated classify calls reuse the scanned vocabulary."""
+        from domain_classifier import DomainClassifier
+
+        classifier = DomainClassifier(mock_ollama, mock_scanner)
+        for _ in range(3):
+            classifier.classify("Buy groceries")
+
+        mock_scanner.get_vocabulary.assert_called_once()
+
     def test_handles_malformed_json_response(self, mock_ollama, mock_scanner):
         """Handles malformed JSON from LLM."""
         from domain_classifier import DomainClassifier
@@ -259,6 +269,67 @@ class TestDomainClassifier:
         assert result.domain in ["Personal", "unknown"]
 
 
+class TestClassifyBatch:
+    """Test DomainClassifier.classify_batch."""
+
+    @pytest.fixture
+    def mock_scanner(self):
+        scanner = Mock()
+        scanner.get_vocabulary.return_value = {"domains": ["CCBH", "Just-Value", "Personal"]}
+        return scanner
+
+    def test_single_llm_call_for_batch(self, mock_scanner):
+        """All non-empty messages are classified in one chat call."""
+        from domain_classifier import DomainClassifier
+
+        ollama = Mock()
+        ollama.chat.return_value = {
+            "message": {
+                "content": '[{"domain": "personal", "confidence": 0.9, "reasoning": "a"},'
+                           ' {"domain": "CCBH", "confidence": 0.7, "reasoning": "b"}]'
+            }
+        }
+
+        classifier = DomainClassifier(ollama, mock_scanner)
+        results = classifier.classify_batch(["Buy milk", "", "Patient intake form"])
+
+        ollama.chat.assert_called_once()
+        assert [r.domain for r in results] == ["Personal", "unknown", "CCBH"]
+        assert results[1].reasoning == "Empty message cannot be classified"
+
+    def test_falls_back_when_counts_mismatch(self, mock_scanner):
+        """A reply with the wrong number of items triggers per-message calls."""
+        from domain_classifier import DomainClassifier
+
+        single = '{"domain": "Personal", "confidence": 0.8, "reasoning": "x"}'
+        ollama = Mock()
+        ollama.chat.side_effect = [
+            {"message": {"content": "[" + single + "]"}},
+            {"message": {"content": single}},
+            {"message": {"content": single}},
+        ]
+
+        classifier = DomainClassifier(ollama, mock_scanner)
+        results = classifier.classify_batch(["one", "two"])
+
+        assert ollama.chat.call_count == 3
+        assert [r.domain for r in results] == ["Personal", "Personal"]
+
+    def test_ollama_error_not_retried_per_message(self, mock_scanner):
+        """A failed batch call reports the error for each message once."""
+        from domain_classifier import DomainClassifier
+        from ollama_client import OllamaTimeout
+
+        ollama = Mock()
+        ollama.chat.side_effect = OllamaTimeout("slow")
+
+        classifier = DomainClassifier(ollama, mock_scanner)
+        results = classifier.classify_batch(["one", "two"])
+
+        ollama.chat.assert_called_once()
+        assert all(r.reasoning == "Error: Ollama request timed out" for r in results)
+
+
 class TestConvenienceFunction:
     """Test module-level convenience function."""
 
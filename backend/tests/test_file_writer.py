@@ -75,6 +75,13 @@ class TestSanitizeFilename:
         assert not result.startswith("-")
         assert not result.endswith("-")
 
+    def test_ascii_and_unicode_paths_agree(self):
+        """Punctuation is dropped and whitespace hyphenated with or without non-ASCII."""
+        from file_writer import sanitize_filename
+
+        assert sanitize_filename("Don't stop\tnow!") == "dont-stop-now"
+        assert sanitize_filename("Café notes here") == "caf-notes-here"
+
 
 class TestBuildFrontmatter:
     """Test cases for build_frontmatter function."""
@@ -364,6 +371,29 @@ class TestCreateNoteFile:
         result = create_note_file(classification, "Test", tmp_path)
         assert isinstance(result, Path)
 
+    def test_recreates_folder_removed_after_first_note(self, tmp_path):
+        """A subject folder deleted mid-process is recreated, not dead-lettered."""
+        import shutil
+        from file_writer import create_note_file
+        from message_classifier import ClassificationResult
+        
+        classification = ClassificationResult(
+            domain="Personal",
+            para_type="1_Projects",
+            subject="apps",
+            category="idea",
+            confidence=0.75,
+            reasoning="App idea"
+        )
+        
+        first = create_note_file(classification, "First", tmp_path)
+        shutil.rmtree(first.parent)
+        
+        second = create_note_file(classification, "Second", tmp_path)
+        
+        assert second.exists()
+        assert "Second" in second.read_text()
+
 
 class TestYouTubeNoteHelpers:
     """Test cases for YouTube note helper functions."""
@@ -435,6 +465,11 @@ class TestSafeAttachmentFilename:
         existing.add("my-file_1.pdf")
         assert safe_attachment_filename("My File.pdf", existing) == "my-file_2.pdf"
 
+    def test_collision_continues_after_highest_suffix(self):
+        from file_writer import safe_attachment_filename
+        existing = {"image.png", "image_7.png", "image_9.jpg", "image_x.png"}
+        assert safe_attachment_filename("image.png", existing) == "image_8.png"
+
 
 class TestAppendAttachmentsSection:
     """Tests for append_attachments_section."""
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Tests for fix_handler module.
+
+Covers thread selection and fix: command handling with Slack mocked out.
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+class TestProcessFixCommands:
+    """Tests for process_fix_commands thread selection."""
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_skips_messages_without_replies(self, mock_fetch, mock_replies, mock_reply):
+        """Messages with no replies never trigger conversations.replies."""
+        from fix_handler import process_fix_commands
+
+        mock_fetch.return_value = [
+            {"ts": "1.0", "text": "plain message"},
+            {"ts": "2.0", "text": "another", "reply_count": 0},
+        ]
+
+        process_fix_commands()
+
+        mock_replies.assert_not_called()
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_skips_broadcast_replies(self, mock_fetch, mock_replies, mock_reply):
+        """Replies that show up in channel history are not treated as parents."""
+        from fix_handler import process_fix_commands
+
+        mock_fetch.return_value = [
+            {"ts": "3.0", "thread_ts": "1.0", "text": "reply", "reply_count": 0},
+        ]
+
+        process_fix_commands()
+
+        mock_replies.assert_not_called()
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_fetches_each_thread_once(self, mock_fetch, mock_replies, mock_reply):
+        """A thread parent listed twice is only fetched once."""
+        from fix_handler import process_fix_commands
+
+        parent = {"ts": "1.0", "thread_ts": "1.0", "text": "note", "reply_count": 2}
+        mock_fetch.return_value = [parent, dict(parent)]
+        mock_replies.return_value = []
+
+        process_fix_commands()
+
+        mock_replies.assert_called_once_with("1.0")
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_moves_file_found_via_message_mapping(
+        self, mock_fetch, mock_replies, mock_reply, temp_state_dir, tmp_path, monkeypatch
+    ):
+        """fix: resolves the note through the state mapping and moves it."""
+        import fix_handler
+        from state import set_file_for_message, get_file_for_message
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("---\ntype: idea\n---\nbody\n")
+        set_file_for_message("1.0", note)
+
+        mock_fetch.return_value = [{"ts": "1.0", "thread_ts": "1.0", "reply_count": 1}]
+        mock_replies.return_value = [{"ts": "1.0"}, {"ts": "1.1", "text": "fix: projects"}]
+
+        fix_handler.process_fix_commands()
+
+        moved = tmp_path / "projects" / "note.md"
+        assert moved.exists()
+        assert not note.exists()
+        assert get_file_for_message("1.0") == moved
+        assert "type: project" in moved.read_text()
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_fix_command_is_case_insensitive(
+        self, mock_fetch, mock_replies, mock_reply, temp_state_dir, tmp_path, monkeypatch
+    ):
+        """'FIX: People' moves to the lowercase people folder."""
+        import fix_handler
+        from state import set_file_for_message
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("---\ntype: idea\n---\nbody\n")
+        set_file_for_message("1.0", note)
+
+        mock_fetch.return_value = [{"ts": "1.0", "thread_ts": "1.0", "reply_count": 1}]
+        mock_replies.return_value = [{"ts": "1.1", "text": "FIX: People"}]
+
+        fix_handler.process_fix_commands()
+
+        assert (tmp_path / "people" / "note.md").exists()
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_only_latest_fix_in_thread_applied(
+        self, mock_fetch, mock_replies, mock_reply, temp_state_dir, tmp_path, monkeypatch
+    ):
+        """With several fix: replies, only the newest is acted on."""
+        import fix_handler
+        from state import set_file_for_message
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("---\ntype: idea\n---\nbody\n")
+        set_file_for_message("1.0", note)
+
+        mock_fetch.return_value = [{"ts": "1.0", "thread_ts": "1.0", "reply_count": 2}]
+        mock_replies.return_value = [
+            {"ts": "1.1", "text": "fix: projects"},
+            {"ts": "1.2", "text": "fix: admin"},
+        ]
+
+        with patch(
+            "fix_handler.get_file_for_message", wraps=fix_handler.get_file_for_message
+        ) as mock_lookup:
+            fix_handler.process_fix_commands()
+
+        mock_lookup.assert_called_once_with("1.0")
+        mock_reply.assert_called_once()
+        assert (tmp_path / "admin" / "note.md").exists()
+        assert not (tmp_path / "projects").exists()
+
+    @patch("fix_handler.reply_to_message")
+    @patch("fix_handler.fetch_thread_replies")
+    @patch("fix_handler.fetch_messages")
+    def test_fix_not_reapplied_on_next_run(
+        self, mock_fetch, mock_replies, mock_reply, temp_state_dir, tmp_path, monkeypatch
+    ):
+        """A handled fix: reply is not moved or answered again."""
+        import fix_handler
+        from state import set_file_for_message
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("---\ntype: idea\n---\nbody\n")
+        set_file_for_message("1.0", note)
+
+        mock_fetch.return_value = [{"ts": "1.0", "thread_ts": "1.0", "reply_count": 1}]
+        mock_replies.return_value = [{"ts": "1.1", "text": "fix: projects"}]
+
+        fix_handler.process_fix_commands()
+        with patch("fix_handler.move_file") as mock_move:
+            fix_handler.process_fix_commands()
+
+        mock_move.assert_not_called()
+        mock_reply.assert_called_once()
+        assert list((tmp_path / "projects").iterdir()) == [tmp_path / "projects" / "note.md"]
+
+
+class TestMoveFile:
+    """Tests for move_file frontmatter rewriting."""
+
+    def test_body_preserved_after_frontmatter_rewrite(self, tmp_path, monkeypatch):
+        """Only the header is rewritten; the body bytes are copied as-is."""
+        import fix_handler
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        body = "# Title\n\n---\nnot frontmatter\n"
+        note.write_text("---\ntype: idea\ntags:\n  - a\n---\n" + body)
+
+        moved = fix_handler.move_file(note, "projects")
+
+        content = moved.read_text()
+        assert content.startswith("---\ntype: project\n")
+        assert "  - a\n" in content
+        assert "moved_from: ideas\n" in content
+        assert content.endswith("---\n" + body)
+
+    def test_other_frontmatter_lines_kept_verbatim(self, tmp_path, monkeypatch):
+        """Untouched keys keep their quoting; an earlier move is overwritten."""
+        import fix_handler
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "projects" / "note.md"
+        note.parent.mkdir()
+        note.write_text(
+            '---\nname: "Q3: plan"\ntype: project\nmoved_from: ideas\nsource:\n  type: slack\n---\nbody\n'
+        )
+
+        content = fix_handler.move_file(note, "admin").read_text()
+
+        assert content.startswith('---\nname: "Q3: plan"\ntype: admin\nmoved_from: projects\n')
+        assert "  type: slack\n" in content
+        assert content.count("moved_from:") == 1
+        assert "\nmoved_at: " in content
+        assert content.endswith("\n---\nbody\n")
+
+    def test_same_size_header_rewritten_in_place(self, tmp_path):
+        """A header of unchanged length is overwritten without a temp file."""
+        import fix_handler
+
+        note = tmp_path / "note.md"
+        note.write_text("---\ntype: idea\n---\nbody\n")
+        inode = note.stat().st_ino
+
+        fix_handler._rewrite_frontmatter(note, b"---\ntype: task\n---\n", 19)
+
+        assert note.read_text() == "---\ntype: task\n---\nbody\n"
+        assert note.stat().st_ino == inode
+
+    def test_move_to_current_folder_is_a_no_op(self, tmp_path, monkeypatch):
+        """Fixing a note to the folder it is already in leaves it untouched."""
+        import fix_handler
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("---\ntype: idea\n---\nbody\n")
+
+        assert fix_handler.move_file(note, "ideas") == note
+        assert note.read_text() == "---\ntype: idea\n---\nbody\n"
+        assert list(note.parent.iterdir()) == [note]
+
+    def test_file_without_frontmatter_left_unchanged(self, tmp_path, monkeypatch):
+        """Notes without frontmatter are moved untouched."""
+        import fix_handler
+
+        monkeypatch.setattr(fix_handler, "VAULT_PATH", tmp_path)
+        note = tmp_path / "ideas" / "note.md"
+        note.parent.mkdir()
+        note.write_text("just text\n")
+
+        moved = fix_handler.move_file(note, "admin")
+
+        assert moved.read_text() == "just text\n"
@@ -0,0 +1,54 @@
+"""
+Unit tests for the shared frontmatter reader.
+"""
+
+import pytest
+import frontmatter
+from frontmatter import load_frontmatter
+
+
+class TestLoadFrontmatter:
+    """Test cases for load_frontmatter()."""
+
+    def test_parses_mapping_frontmatter(self, tmp_path):
+        """Frontmatter at the top of a note is returned as a dict."""
+        note = tmp_path / "note.md"
+        note.write_text("---\nname: Alpha\nstatus: active\ntags:\n  - a\n---\n\nBody --- text\n")
+
+        assert load_frontmatter(note) == {"name": "Alpha", "status": "active", "tags": ["a"]}
+
+    def test_no_frontmatter_returns_none(self, tmp_path):
+        """Notes that don't open with --- have no frontmatter."""
+        note = tmp_path / "note.md"
+        note.write_text("# Title\n\n---\nname: not frontmatter\n---\n")
+
+        assert load_frontmatter(note) is None
+
+    def test_unclosed_frontmatter_returns_none(self, tmp_path):
+        """A missing closing marker yields None rather than parsing the body."""
+        note = tmp_path / "note.md"
+        note.write_text("---\nname: Alpha\n")
+
+        assert load_frontmatter(note) is None
+
+    def test_non_mapping_frontmatter_returns_none(self, tmp_path):
+        """Scalar frontmatter is ignored."""
+        note = tmp_path / "note.md"
+        note.write_text("---\njust a string\n---\n")
+
+        assert load_frontmatter(note) is None
+
+    def test_frontmatter_longer_than_head(self, tmp_path, monkeypatch):
+        """Frontmatter extending past the head read is still parsed."""
+        monkeypatch.setattr(frontmatter, "HEAD_BYTES", 16)
+        note = tmp_path / "note.md"
+        note.write_text("---\nname: Alpha\nnext_action: write the long tests\n---\nbody\n")
+
+        assert load_frontmatter(note)["next_action"] == "write the long tests"
+
+    def test_crlf_line_endings(self, tmp_path):
+        """Windows line endings are accepted."""
+        note = tmp_path / "note.md"
+        note.write_bytes(b"---\r\nname: Alpha\r\n---\r\nbody\r\n")
+
+        assert load_frontmatter(note) == {"name": "Alpha"}
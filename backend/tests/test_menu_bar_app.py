@@ -31,6 +31,18 @@ class TestMenuBarCoreInit:
         
         assert core._state_dir == tmp_path
 
+    def test_imports_without_notifications_module(self):
+        """A missing notifications module only disables notifications."""
+        import importlib
+        import menu_bar_app
+        
+        try:
+            with patch.dict("sys.modules", {"notifications": None}):
+                importlib.reload(menu_bar_app)
+                assert menu_bar_app.notify_note_filed("t", "d", "p", "/x.md") is None
+        finally:
+            importlib.reload(menu_bar_app)
+
 
 class TestStatusManagement:
     """Tests for status updates."""
@@ -153,6 +165,21 @@ class TestRecentActivity:
         # Most recent should be first
         assert activity[0]["title"] == "Note 6"
     
+    def test_oversized_activity_file_keeps_newest(self, tmp_path):
+        """A file holding more than 5 entries shows its first (newest) five."""
+        from menu_bar_app import MenuBarCore
+        
+        items = [{"title": f"Note {i}"} for i in range(6, 0, -1)]
+        (tmp_path / "recent_activity.json").write_text(json.dumps(items))
+        
+        core = MenuBarCore(state_dir=tmp_path)
+        activity = core.get_recent_activity()
+        
+        assert [a["title"] for a in activity] == ["Note 6", "Note 5", "Note 4", "Note 3", "Note 2"]
+        
+        core.add_recent_activity("Note 7", "Personal", "/path/7.md")
+        assert [a["title"] for a in core.get_recent_activity()][:2] == ["Note 7", "Note 6"]
+    
     def test_recent_activity_persists(self, tmp_path):
         """Recent activity persists across instances."""
         from menu_bar_app import MenuBarCore
@@ -163,10 +190,25 @@ class TestRecentActivity:
         # New instance should see the activity
         core2 = MenuBarCore(state_dir=tmp_path)
         activity = core2.get_recent_activity()
-        
+
         assert len(activity) == 1
         assert activity[0]["title"] == "Test"
 
+    def test_recent_activity_read_from_cache_until_file_changes(self, tmp_path):
+        """Unchanged activity file is not re-parsed; external writes are seen."""
+        import json
+        from menu_bar_app import MenuBarCore
+
+        core = MenuBarCore(state_dir=tmp_path)
+        core.add_recent_activity("Test", "Personal", "/path/test.md")
+
+        with patch("menu_bar_app._loads_activity") as mock_load:
+            assert core.get_recent_activity()[0]["title"] == "Test"
+        mock_load.assert_not_called()
+
+        (tmp_path / "recent_activity.json").write_text(json.dumps([{"title": "Other one"}]))
+        assert core.get_recent_activity() == [{"title": "Other one"}]
+
 
 class TestSync:
     """Tests for sync operations."""
@@ -272,6 +314,39 @@ class TestHealthCheck:
         assert health["ollama"]["ready"] is False
         assert health["ollama"]["error"] == "Connection refused"
 
+    @patch("menu_bar_app.OllamaClient")
+    def test_health_check_reuses_ollama_client(self, mock_client_class, tmp_path):
+        """Repeated health checks share one OllamaClient."""
+        from menu_bar_app import MenuBarCore
+
+        mock_client_class.return_value.health_check.return_value = Mock(ready=True, error=None)
+
+        core = MenuBarCore(state_dir=tmp_path)
+        core.health_check()
+        core.health_check()
+
+        mock_client_class.assert_called_once()
+        assert mock_client_class.return_value.health_check.call_count == 2
+
+    @patch("menu_bar_app.OllamaClient")
+    def test_health_check_vault_result_reused_within_ttl(self, mock_client_class, tmp_path, monkeypatch):
+        """The vault stat is reused until VAULT_CHECK_TTL passes."""
+        import menu_bar_app
+        from menu_bar_app import MenuBarCore
+
+        monkeypatch.setattr(menu_bar_app, "VAULT_ROOT", tmp_path / "vault")
+        clock = [100.0]
+        monkeypatch.setattr(menu_bar_app.time, "monotonic", lambda: clock[0])
+
+        core = MenuBarCore(state_dir=tmp_path)
+        assert core.health_check()["vault"]["ready"] is False
+
+        (tmp_path / "vault").mkdir()
+        assert core.health_check()["vault"]["ready"] is False
+
+        clock[0] += menu_bar_app.VAULT_CHECK_TTL
+        assert core.health_check()["vault"]["ready"] is True
+
 
 class TestMenuBarApp:
     """Tests for MenuBarApp wrapper."""
@@ -318,10 +393,90 @@ class TestMenuBarApp:
         
         app = MenuBarApp(core=core)
         activity = app.get_recent_activity()
-        
+
         assert len(activity) == 1
         assert activity[0]["title"] == "Test"
 
+    @patch("menu_bar_app.rumps", create=True)
+    def test_recent_menu_refilled_only_when_activity_changes(self, mock_rumps, tmp_path):
+        """The refresh timer leaves the submenu alone until new activity arrives."""
+        from menu_bar_app import MenuBarApp, MenuBarCore
+
+        mock_rumps.MenuItem.side_effect = lambda *args, **kwargs: Mock()
+        core = MenuBarCore(state_dir=tmp_path)
+        core.add_recent_activity("First", "Personal", "/path/1.md")
+        app = MenuBarApp(core=core)
+
+        recent_menu = app._build_recent_menu()
+        assert recent_menu.add.call_count == 1
+
+        app._refresh_recent_menu()
+        recent_menu.clear.assert_not_called()
+
+        core.add_recent_activity("Second", "Personal", "/path/2.md")
+        app._refresh_recent_menu()
+        recent_menu.clear.assert_called_once()
+        assert recent_menu.add.call_count == 3
+
+    def test_submitted_work_runs_in_order_on_one_thread(self, tmp_path):
+        """Queued callbacks share one worker and a failure doesn't stop it."""
+        import threading
+        from menu_bar_app import MenuBarApp, MenuBarCore
+
+        app = MenuBarApp(core=MenuBarCore(state_dir=tmp_path))
+        calls = []
+
+        def record(name):
+            calls.append((name, threading.current_thread()))
+
+        def fail():
+            raise RuntimeError("boom")
+
+        app._submit(record, "a")
+        app._submit(fail)
+        app._submit(record, "b")
+        app._work_queue.join()
+
+        assert [name for name, _ in calls] == ["a", "b"]
+        assert calls[0][1] is calls[1][1] is app._worker
+
+    @patch("menu_bar_app.process_all")
+    def test_sync_clicks_coalesce_while_sync_pending(self, mock_process, tmp_path):
+        """Clicking Sync while one is queued or running doesn't queue another."""
+        import threading
+        from menu_bar_app import MenuBarApp, MenuBarCore
+
+        release = threading.Event()
+        mock_process.side_effect = lambda: release.wait(5)
+        app = MenuBarApp(core=MenuBarCore(state_dir=tmp_path))
+
+        for _ in range(5):
+            app._sync_callback(None)
+        release.set()
+        app._work_queue.join()
+        assert mock_process.call_count == 1
+
+        app._sync_callback(None)
+        app._work_queue.join()
+        assert mock_process.call_count == 2
+
+    def test_title_only_set_when_icon_changes(self, tmp_path):
+        """Repeating the shown status icon skips the menu bar update."""
+        from menu_bar_app import MenuBarApp, MenuBarCore, STATUS_ICONS
+
+        app = MenuBarApp(core=MenuBarCore(state_dir=tmp_path))
+        app._rumps_app = Mock()
+        setter = Mock()
+        type(app._rumps_app).title = property(lambda self: None, lambda self, v: setter(v))
+
+        app.set_status("syncing")
+        app.set_status("syncing")
+        app.set_status("idle")
+
+        assert [c.args[0] for c in setter.call_args_list] == [
+            STATUS_ICONS["syncing"], STATUS_ICONS["idle"]
+        ]
+
 
 class TestOpenNote:
     """Tests for open_note function."""
@@ -351,3 +506,16 @@ class TestOpenNote:
         assert "vault=PARA" in url
         # Should not have .md extension
         assert ".md" not in url or "file=" in url
+
+    @patch("menu_bar_app.subprocess.run")
+    def test_open_note_relative_path_and_sibling_folder(self, mock_run, tmp_path, monkeypatch):
+        """Vault notes keep their relative path; a sibling folder sharing the prefix does not."""
+        import menu_bar_app
+
+        monkeypatch.setattr(menu_bar_app, "VAULT_ROOT", tmp_path / "Home")
+
+        menu_bar_app.open_note(tmp_path / "Home" / "Personal" / "my.md notes.md")
+        assert mock_run.call_args[0][0][1].endswith("vault=Home&file=Personal/my.md%20notes")
+
+        menu_bar_app.open_note(str(tmp_path / "HomeOld" / "note.md"))
+        assert mock_run.call_args[0][0][1].endswith("vault=Home&file=note")
@@ -213,6 +213,32 @@ class TestSubjectClassification:
                     result = classifier.classify("Random unknown topic")
                     assert result.subject == "general"
 
+    def test_subject_lookup_prefers_domain_and_follows_structure_changes(self):
+        """Same-domain subjects win over other domains; a new structure is honoured."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier(ollama_client=Mock(), vault_scanner=Mock())
+        structure = {
+            "Work": {"2_Areas": ["Apps"]},
+            "Personal": {"1_Projects": ["notes"], "2_Areas": ["apps"]},
+        }
+
+        assert classifier._validate_subject("APPS", structure, "Personal", "1_Projects") == "apps"
+        assert classifier._validate_subject("apps", structure, "Other", "1_Projects") == "Apps"
+
+        changed = {"Personal": {"1_Projects": ["garden"]}}
+        assert classifier._validate_subject("apps", changed, "Personal", "1_Projects") == "general"
+        assert classifier._validate_subject("Garden", changed, "Personal", "1_Projects") == "garden"
+
+    def test_subject_match_ignores_unicode_case(self):
+        """Subjects match under full Unicode case folding, not just lower()."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier(ollama_client=Mock(), vault_scanner=Mock())
+        structure = {"Personal": {"2_Areas": ["Straße"]}}
+
+        assert classifier._validate_subject("STRASSE", structure, "Personal", "2_Areas") == "Straße"
+
 
 class TestCategoryClassification:
     """Test cases for category classification."""
@@ -320,6 +346,28 @@ class TestResponseParsing:
                     # Should still parse the domain
                     assert result.domain == "Personal"
 
+    def test_braces_inside_reasoning_still_parse_as_json(self):
+        """A reasoning string containing braces doesn't break JSON parsing."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        mock_response = {
+            "message": {
+                "content": 'Note {draft}: {"domain": "Personal", "para_type": "2_Areas", "subject": "apps", '
+                           '"category": "idea", "confidence": 0.7, "reasoning": "uses {placeholders} and \\"quotes\\""}'
+            }
+        }
+        mock_vocab = {"domains": ["Personal"], "para_types": [], "subjects": ["apps"]}
+        mock_structure = {"Personal": {"2_Areas": ["apps"]}}
+
+        with patch.object(classifier._ollama_client, 'chat', return_value=mock_response):
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=mock_structure):
+                    result = classifier.classify("Test message")
+
+        assert result.reasoning == 'uses {placeholders} and "quotes"'
+        assert result.para_type == "2_Areas"
+
 
 class TestErrorHandling:
     """Test cases for error handling."""
@@ -393,6 +441,239 @@ class TestErrorHandling:
                     assert 0.0 <= result.confidence <= 1.0
 
 
+class TestFastPath:
+    """Test cases for rule-based classification without the LLM."""
+
+    def test_unambiguous_message_skips_llm(self):
+        """Domain, subject folder and category cue all named: no LLM call."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        mock_vocab = {"domains": ["Personal", "CCBH"], "para_types": [], "subjects": ["apps", "clients"]}
+        mock_structure = {"Personal": {"1_Projects": ["apps"]}, "CCBH": {"2_Areas": ["clients"]}}
+
+        with patch.object(classifier._ollama_client, 'chat') as mock_chat:
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=mock_structure):
+                    result = classifier.classify("CCBH call with clients on Friday")
+
+        mock_chat.assert_not_called()
+        assert (result.domain, result.para_type, result.subject, result.category) == (
+            "CCBH", "2_Areas", "clients", "meeting"
+        )
+        assert result.reasoning == "rule match"
+
+    def test_ambiguous_message_uses_llm(self):
+        """Two category cues (meeting and task) fall through to the LLM."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        mock_response = make_mock_response("CCBH", "2_Areas", "clients", "task", 0.8, "llm")
+        mock_vocab = {"domains": ["CCBH"], "para_types": [], "subjects": ["clients"]}
+        mock_structure = {"CCBH": {"2_Areas": ["clients"]}}
+
+        with patch.object(classifier._ollama_client, 'chat', return_value=mock_response) as mock_chat:
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=mock_structure):
+                    result = classifier.classify("CCBH clients meeting deadline")
+
+        mock_chat.assert_called_once()
+        assert result.reasoning == "llm"
+
+    def test_term_patterns_compiled_once_per_vocabulary(self):
+        """Domain and subject patterns are built once, not per message."""
+        import message_classifier
+        from message_classifier import MessageClassifier
+
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal", "CCBH"]}
+        mock_vault.get_structure.return_value = {"CCBH": {"2_Areas": ["clients", "billing"]}}
+        classifier = MessageClassifier(ollama_client=Mock(), vault_scanner=mock_vault)
+
+        with patch.object(
+            message_classifier, "_term_pattern", wraps=message_classifier._term_pattern
+        ) as mock_pattern:
+            for message in ("CCBH call with clients", "CCBH billing deadline", "CCBH sync on billing"):
+                assert classifier.classify(message).reasoning == "rule match"
+
+        assert mock_pattern.call_count == 4
+
+
+class TestPromptLayout:
+    """Test cases for the system/user prompt split."""
+
+    def test_vocabulary_in_shared_system_message(self):
+        """Only the user message changes between classifications."""
+        from message_classifier import MessageClassifier
+
+        mock_ollama = Mock()
+        mock_ollama.chat.return_value = make_mock_response("Personal", "1_Projects", "apps", "idea", 0.9, "x")
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal"]}
+        mock_vault.get_structure.return_value = {"Personal": {"1_Projects": ["apps"]}}
+
+        classifier = MessageClassifier(ollama_client=mock_ollama, vault_scanner=mock_vault)
+        classifier.classify("first idea")
+        classifier.classify("second idea")
+
+        first, second = (c.args[0] for c in mock_ollama.chat.call_args_list)
+        assert first[0]["role"] == "system" and first[0] == second[0]
+        assert "Personal: apps" in first[0]["content"]
+        assert '"first idea"' in first[1]["content"]
+        assert "Personal: apps" not in first[1]["content"]
+
+
+class TestStructuredOutput:
+    """Test cases for schema-constrained replies."""
+
+    def test_schema_limits_fields_to_vocabulary(self):
+        """classify() sends a JSON schema with the vocabulary as enums."""
+        from message_classifier import MessageClassifier, VALID_PARA_TYPES
+
+        mock_ollama = Mock()
+        mock_ollama.chat.return_value = make_mock_response("Personal", "1_Projects", "apps", "task", 0.9, "x")
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal", "CCBH"]}
+        mock_vault.get_structure.return_value = {"Personal": {"1_Projects": ["apps"]}}
+
+        MessageClassifier(ollama_client=mock_ollama, vault_scanner=mock_vault).classify("Build it")
+
+        schema = mock_ollama.chat.call_args.kwargs["format"]
+        assert schema["properties"]["domain"]["enum"] == ["Personal", "CCBH"]
+        assert schema["properties"]["para_type"]["enum"] == VALID_PARA_TYPES
+        assert schema["properties"]["subject"]["enum"] == ["apps", "general"]
+        assert set(schema["required"]) == set(schema["properties"])
+
+    def test_rejected_format_retried_without_schema_once(self):
+        """A server without structured outputs is asked plainly from then on."""
+        from message_classifier import MessageClassifier
+        from ollama_client import OllamaFormatUnsupported
+
+        reply = make_mock_response("Personal", "1_Projects", "apps", "task", 0.9, "x")
+        mock_ollama = Mock()
+        mock_ollama.chat.side_effect = [OllamaFormatUnsupported("invalid format"), reply, reply]
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal"]}
+        mock_vault.get_structure.return_value = {"Personal": {"1_Projects": ["apps"]}}
+
+        classifier = MessageClassifier(ollama_client=mock_ollama, vault_scanner=mock_vault)
+        assert classifier.classify("first").subject == "apps"
+        classifier.classify("second")
+
+        assert [("format" in c.kwargs) for c in mock_ollama.chat.call_args_list] == [True, False, False]
+
+    def test_transient_error_keeps_schema(self):
+        """Other API errors are raised and don't turn structured output off."""
+        from message_classifier import MessageClassifier
+        from ollama_client import OllamaError
+
+        reply = make_mock_response("Personal", "1_Projects", "apps", "task", 0.9, "x")
+        mock_ollama = Mock()
+        mock_ollama.chat.side_effect = [OllamaError("Ollama API error: internal"), reply]
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal"]}
+        mock_vault.get_structure.return_value = {"Personal": {"1_Projects": ["apps"]}}
+
+        classifier = MessageClassifier(ollama_client=mock_ollama, vault_scanner=mock_vault)
+        with pytest.raises(OllamaError):
+            classifier.classify("first")
+        classifier.classify("second")
+
+        assert [("format" in c.kwargs) for c in mock_ollama.chat.call_args_list] == [True, True]
+
+
+class TestResultCache:
+    """Test cases for reusing results of repeated messages."""
+
+    def test_repeat_message_reuses_result_until_vault_changes(self):
+        """Case/whitespace variants hit the cache; a new structure misses it."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        mock_response = make_mock_response("Personal", "1_Projects", "apps", "idea", 0.8, "llm")
+        mock_vocab = {"domains": ["Personal"], "para_types": [], "subjects": ["apps"]}
+        structure = {"Personal": {"1_Projects": ["apps"]}}
+
+        with patch.object(classifier._ollama_client, 'chat', return_value=mock_response) as mock_chat:
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=structure):
+                    first = classifier.classify("New app idea")
+                    second = classifier.classify("  new APP   idea ")
+                assert mock_chat.call_count == 1
+                assert second is first
+
+                changed = {"Personal": {"1_Projects": ["apps", "garden"]}}
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=changed):
+                    classifier.classify("New app idea")
+                assert mock_chat.call_count == 2
+
+
+class TestClassifyBatch:
+    """Test cases for MessageClassifier.classify_batch."""
+
+    def test_batch_uses_one_llm_call(self):
+        """Several messages are classified from one JSON array reply."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        items = [
+            {"domain": "Personal", "para_type": "1_Projects", "subject": "apps",
+             "category": "task", "confidence": 0.9, "reasoning": "a"},
+            {"domain": "nope", "para_type": "2_Areas", "subject": "other",
+             "category": "idea", "confidence": 0.7, "reasoning": "b"},
+        ]
+        mock_response = {"message": {"content": "Sure:\n" + json.dumps(items)}}
+        mock_vocab = {"domains": ["Personal"], "para_types": [], "subjects": ["apps"]}
+        mock_structure = {"Personal": {"1_Projects": ["apps"]}}
+
+        with patch.object(classifier._ollama_client, 'chat', return_value=mock_response) as mock_chat:
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value=mock_structure):
+                    results = classifier.classify_batch(["Build app", "Random thought"])
+
+        mock_chat.assert_called_once()
+        assert [r.subject for r in results] == ["apps", "general"]
+        assert [r.category for r in results] == ["task", "idea"]
+        assert results[1].domain == "Personal"
+
+    def test_mismatched_reply_falls_back_to_classify(self):
+        """A reply with the wrong number of results classifies one by one."""
+        from message_classifier import MessageClassifier
+
+        classifier = MessageClassifier()
+        batch_reply = {"message": {"content": "[]"}}
+        single = make_mock_response("Personal", "1_Projects", "general", "task", 0.8, "x")
+        mock_vocab = {"domains": ["Personal"], "para_types": [], "subjects": []}
+
+        with patch.object(classifier._ollama_client, 'chat', side_effect=[batch_reply, single, single]) as mock_chat:
+            with patch.object(classifier._vault_scanner, 'get_vocabulary', return_value=mock_vocab):
+                with patch.object(classifier._vault_scanner, 'get_structure', return_value={}):
+                    results = classifier.classify_batch(["one", "two"])
+
+        assert mock_chat.call_count == 3
+        assert [r.category for r in results] == ["task", "task"]
+
+
+class TestPreload:
+    """Test cases for model preloading at construction."""
+
+    def test_pipeline_mode_preloads_each_step_model(self, monkeypatch):
+        """Pipeline mode warms every configured step model once."""
+        from message_classifier import MessageClassifier
+
+        monkeypatch.setenv("CLASSIFICATION_MODE", "pipeline")
+        monkeypatch.setenv("OLLAMA_MODEL_DOMAIN", "small")
+        monkeypatch.setenv("OLLAMA_MODEL_PARA", "small")
+        monkeypatch.setenv("OLLAMA_MODEL_FULL", "large")
+        client = Mock()
+
+        classifier = MessageClassifier(ollama_client=client, vault_scanner=Mock())
+        client.preload.assert_not_called()
+        classifier._preload_models()
+
+        assert sorted(c.args[0] for c in client.preload.call_args_list) == ["large", "small"]
+
+
 class TestConvenienceFunction:
     """Test cases for classify_message convenience function."""
     
@@ -482,6 +763,19 @@ class TestLoadSop:
         empty = Path("/nonexistent/sop/path")
         assert _load_sop(empty) == ""
 
+    def test_sop_cached_until_invalidated(self, tmp_path):
+        """SOP files are read once; invalidate_cache() picks up edits."""
+        from message_classifier import MessageClassifier, _load_sop
+
+        (tmp_path / "naming.md").write_text("old rules")
+        assert _load_sop(tmp_path) == "old rules"
+
+        (tmp_path / "naming.md").write_text("new rules")
+        assert _load_sop(tmp_path) == "old rules"
+
+        MessageClassifier(ollama_client=Mock(), vault_scanner=Mock()).invalidate_cache()
+        assert _load_sop(tmp_path) == "new rules"
+
 
 class TestPipelineMode:
     """Tests for pipeline classification mode (CLASSIFICATION_MODE=pipeline)."""
@@ -512,3 +806,53 @@ class TestPipelineMode:
         assert 0.0 <= result.confidence <= 1.0
         assert "Pipeline" in result.reasoning
         assert mock_ollama.chat.call_count == 3
+
+    @staticmethod
+    def _step_replies(domain):
+        """Chat side effect answering each pipeline step by its prompt."""
+        def reply(messages, **kwargs):
+            prompt = messages[-1]["content"]
+            if "ONE domain" in prompt:
+                content = f'{{"domain": "{domain}", "confidence": 0.9, "reasoning": "d"}}'
+            elif "ONE PARA type" in prompt:
+                content = '{"para_type": "1_Projects", "confidence": 0.85, "reasoning": "p"}'
+            else:
+                content = '{"subject": "general", "category": "task", "confidence": 0.8, "reasoning": "s"}'
+            return {"message": {"content": content}}
+        return reply
+
+    def _pipeline_classifier(self, domain):
+        from message_classifier import MessageClassifier
+        from unittest.mock import Mock
+
+        mock_ollama = Mock()
+        mock_ollama.chat.side_effect = self._step_replies(domain)
+        mock_vault = Mock()
+        mock_vault.get_vocabulary.return_value = {"domains": ["Personal", "CCBH"]}
+        mock_vault.get_structure.return_value = {"Personal": {"1_Projects": []}, "CCBH": {"1_Projects": []}}
+        return MessageClassifier(ollama_client=mock_ollama, vault_scanner=mock_vault), mock_ollama
+
+    @patch.dict("os.environ", {"CLASSIFICATION_MODE": "pipeline"}, clear=False)
+    def test_pipeline_uses_speculative_para_step_when_domain_matches(self):
+        """A domain named in the message gets its PARA step issued alongside step 1."""
+        classifier, mock_ollama = self._pipeline_classifier("CCBH")
+
+        result = classifier.classify("Draft the CCBH budget")
+
+        assert (result.domain, result.para_type) == ("CCBH", "1_Projects")
+        assert mock_ollama.chat.call_count == 3
+
+    @patch.dict("os.environ", {"CLASSIFICATION_MODE": "pipeline"}, clear=False)
+    def test_pipeline_redoes_para_step_when_domain_differs(self):
+        """The speculative PARA step is discarded if step 1 picks another domain."""
+        classifier, mock_ollama = self._pipeline_classifier("Personal")
+
+        result = classifier.classify("Draft the CCBH budget")
+
+        assert result.domain == "Personal"
+        assert mock_ollama.chat.call_count == 4
+        para_prompts = [
+            c.args[0][-1]["content"] for c in mock_ollama.chat.call_args_list
+            if "ONE PARA type" in c.args[0][-1]["content"]
+        ]
+        assert any("Domain (already chosen): Personal" in p for p in para_prompts)
@@ -188,6 +188,50 @@ class TestOllamaChat:
             with pytest.raises(OllamaModelNotFound):
                 client.chat([{"role": "user", "content": "test"}])
 
+    def test_chat_rejected_format_raises_format_unsupported(self):
+        """A 400 naming format becomes OllamaFormatUnsupported; other errors don't."""
+        from ollama_client import OllamaClient, OllamaError, OllamaFormatUnsupported
+        
+        client = OllamaClient()
+        messages = [{"role": "user", "content": "test"}]
+        
+        error = ResponseError("invalid format: expected \"json\" or a JSON schema", status_code=400)
+        with patch.object(client.client, 'chat', side_effect=error):
+            with pytest.raises(OllamaFormatUnsupported):
+                client.chat(messages, format={"type": "object"})
+        
+        error = ResponseError("internal server error", status_code=500)
+        with patch.object(client.client, 'chat', side_effect=error):
+            with pytest.raises(OllamaError) as excinfo:
+                client.chat(messages, format={"type": "object"})
+        assert not isinstance(excinfo.value, OllamaFormatUnsupported)
+
+    def test_chat_stop_after_json_stops_reading_stream(self):
+        """stop_after_json returns once the object closes and closes the stream."""
+        from ollama_client import OllamaClient
+        
+        client = OllamaClient()
+        pulled = []
+        
+        def chunks():
+            for piece in ['{"domain": "Per', 'sonal", "reasoning": "a {b}"}', " and more", " text"]:
+                pulled.append(piece)
+                yield {"message": {"content": piece}}
+        
+        stream = chunks()
+        with patch.object(client.client, 'chat', return_value=stream) as mock_chat:
+            response = client.chat(
+                [{"role": "user", "content": "test"}],
+                options={"num_predict": 8},
+                stop_after_json=True
+            )
+        
+        assert response["message"]["content"] == '{"domain": "Personal", "reasoning": "a {b}"}'
+        assert len(pulled) == 2
+        assert mock_chat.call_args.kwargs["stream"] is True
+        assert mock_chat.call_args.kwargs["options"] == {"num_predict": 8}
+        assert stream.gi_frame is None  # generator closed
+
 
 class TestOllamaGenerate:
     """Test cases for generate operations."""
@@ -241,6 +285,55 @@ class TestOllamaVerify:
             assert client.verify_model_responds() is False
 
 
+class TestOllamaPreload:
+    """Test cases for model preloading."""
+    
+    def test_preload_sends_empty_prompt_with_keep_alive(self):
+        """preload() loads the model with an empty prompt and keep_alive."""
+        from ollama_client import OllamaClient
+        
+        client = OllamaClient(model="test-model", keep_alive="10m")
+        
+        with patch.object(client.client, 'generate') as mock_generate:
+            assert client.preload() is True
+        
+        mock_generate.assert_called_once_with(model="test-model", prompt="", keep_alive="10m")
+    
+    def test_preload_failure_returns_false(self):
+        """preload() swallows errors so a warm-up never breaks startup."""
+        from ollama_client import OllamaClient
+        
+        client = OllamaClient()
+        
+        with patch.object(client.client, 'generate', side_effect=httpx.ConnectError("refused")):
+            assert client.preload() is False
+
+
+class TestOllamaConnectionPool:
+    """Test cases for connection reuse."""
+    
+    def test_clients_share_one_transport(self):
+        """Chat and health clients of every instance use the same pool."""
+        from ollama_client import OllamaClient
+        
+        first, second = OllamaClient(), OllamaClient()
+        
+        transports = {
+            id(c._client._transport)
+            for c in (first.client, first.health_client, second.client, second.health_client)
+        }
+        assert len(transports) == 1
+    
+    def test_health_client_keeps_short_timeout(self):
+        """Sharing the pool doesn't change per-client timeouts."""
+        from ollama_client import OllamaClient, HEALTH_CHECK_TIMEOUT
+        
+        client = OllamaClient(timeout=60.0)
+        
+        assert client.client._client.timeout.read == 60.0
+        assert client.health_client._client.timeout.read == HEALTH_CHECK_TIMEOUT
+
+
 # Integration tests (require real Ollama)
 @pytest.mark.integration
 class TestOllamaIntegration:
@@ -200,6 +200,37 @@ class TestProcessAll:
         
         mock_record.assert_called_once()
 
+    @patch("process_inbox.fetch_new_messages")
+    @patch("process_inbox.record_successful_run")
+    @patch("process_inbox.cleanup_old_processed_messages")
+    def test_last_ts_written_once_at_end_of_run(
+        self, mock_cleanup, mock_record, mock_fetch, temp_state_dir, tmp_path, monkeypatch
+    ):
+        """LAST_TS_FILE is written once with the newest processed ts."""
+        import process_inbox
+
+        last_ts_file = tmp_path / ".last_processed_ts"
+        monkeypatch.setattr(process_inbox, "LAST_TS_FILE", last_ts_file)
+        monkeypatch.setattr(process_inbox, "_pending_last_ts", None)
+
+        mock_fetch.return_value = [
+            {"text": "newer", "ts": "1234567892.0"},
+            {"text": "older", "ts": "1234567890.0"},
+        ]
+        seen = []
+
+        def fake_process(msg):
+            # Nothing is persisted mid-run
+            seen.append(last_ts_file.exists())
+            process_inbox._pending_last_ts = msg["ts"]
+            return True
+
+        with patch("process_inbox.process_message", side_effect=fake_process):
+            process_inbox.process_all()
+
+        assert seen == [False, False]
+        assert last_ts_file.read_text() == "1234567892.0"
+
 
 class TestPollingConfig:
     """Tests for polling configuration."""
@@ -158,7 +158,7 @@ def test_slack_api_error_with_invalid_token(monkeypatch):
     mock_response.status_code = 200
     mock_response.json.return_value = {"ok": False, "error": "invalid_auth"}
 
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         with pytest.raises(SlackAPIError, match="invalid_auth"):
             fetch_messages()
 
@@ -173,7 +173,7 @@ def test_rate_limit_error_handling(monkeypatch):
     mock_response.status_code = 429
     mock_response.headers = {"Retry-After": "1"}
 
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         with patch("time.sleep"):  # Don't actually sleep in tests
             with pytest.raises(SlackRateLimitError, match="Rate limited"):
                 fetch_messages()
@@ -189,6 +189,13 @@ def test_fetch_messages_returns_empty_list_when_no_messages(monkeypatch):
     mock_response.status_code = 200
     mock_response.json.return_value = {"ok": True, "messages": []}
 
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         messages = fetch_messages()
         assert messages == []
+
+
+def test_get_session_is_reused():
+    """Test that the pooled session is created once and shared."""
+    from slack_client import _get_session
+
+    assert _get_session() is _get_session()
@@ -143,6 +143,25 @@ class TestMessageToFileMapping:
         # Should not raise error
         state.remove_message_mapping(message_ts)
 
+    def test_repeated_lookups_parse_mapping_once(self, temp_state_dir, monkeypatch):
+        """Lookups reuse the parsed mapping until the file is rewritten."""
+        filepath = temp_state_dir / "test-file.md"
+        filepath.write_text("test content")
+        state.set_file_for_message("1.0", filepath)
+
+        reads = []
+        original_read = state._atomic_json_read
+        monkeypatch.setattr(
+            state, "_atomic_json_read", lambda p: reads.append(p) or original_read(p)
+        )
+
+        for _ in range(3):
+            assert state.get_file_for_message("1.0") == filepath
+        assert len(reads) == 1
+
+        state.set_file_for_message("2.0", filepath)
+        assert state.get_file_for_message("2.0") == filepath
+
 
 class TestCleanupOldProcessedMessages:
     """Test cases for cleanup_old_processed_messages()."""
@@ -8,6 +8,7 @@ Tests use tmp_path fixture to avoid accessing real vault.
 
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 
 
 class TestVaultScannerDiscover:
@@ -410,6 +411,31 @@ class TestVaultScannerCache:
         
         assert "Personal" in result
 
+    def test_cache_file_parsed_once_until_rewritten(self, tmp_path, monkeypatch):
+        """Unchanged cache file is not re-parsed; a rewrite is picked up."""
+        from vault_scanner import VaultScanner
+        import vault_scanner
+        
+        (tmp_path / "Personal" / "1_Projects").mkdir(parents=True)
+        cache_dir = tmp_path / ".state"
+        cache_dir.mkdir()
+        cache_file = cache_dir / "vault_cache.json"
+        
+        monkeypatch.setattr(vault_scanner, "CACHE_FILE", cache_file)
+        
+        scanner = VaultScanner(vault_path=tmp_path)
+        scanner.get_structure()
+        
+        real_loads = vault_scanner.json.loads
+        with patch.object(vault_scanner.json, "loads", side_effect=real_loads) as loads:
+            scanner.get_structure()
+            scanner.get_vocabulary()
+            assert loads.call_count == 0
+            
+            (tmp_path / "Work" / "1_Projects").mkdir(parents=True)
+            scanner.manual_rescan()
+            assert "Work" in scanner.get_vocabulary()["domains"]
+
 
 class TestVaultScannerVocabulary:
     """Test vocabulary extraction."""
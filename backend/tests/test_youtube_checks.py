@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for youtube_checks module.
+
+Uses temporary PATH directories instead of the real toolchain.
+"""
+
+import pytest
+
+
+class TestFindExecutables:
+    """Tests for find_executables."""
+
+    def test_find_executables_single_path_walk(self, tmp_path, monkeypatch):
+        """Tools are found in one PATH walk; only found paths are memoized."""
+        import youtube_checks
+
+        bin_a, bin_b = tmp_path / "a", tmp_path / "b"
+        bin_a.mkdir()
+        bin_b.mkdir()
+        (bin_b / "ffmpeg").write_text("")
+        (bin_b / "ffmpeg").chmod(0o755)
+        (bin_a / "yt-dlp").mkdir()  # directories are not executables
+        monkeypatch.setenv("PATH", f"{bin_a}:{bin_b}")
+        monkeypatch.setattr(youtube_checks, "_found_executables", {})
+
+        found = youtube_checks.find_executables(("yt-dlp", "ffmpeg"))
+        assert found == {"yt-dlp": None, "ffmpeg": str(bin_b / "ffmpeg")}
+
+        (bin_b / "yt-dlp").write_text("")
+        (bin_b / "yt-dlp").chmod(0o755)
+        (bin_b / "ffmpeg").unlink()
+        found = youtube_checks.find_executables(("yt-dlp", "ffmpeg"))
+        assert found == {"yt-dlp": str(bin_b / "yt-dlp"), "ffmpeg": str(bin_b / "ffmpeg")}
+
+
+class TestMissingDependencies:
+    """Tests for missing_dependencies."""
+
+    def test_whisper_only_required_in_whisper_mode(self, tmp_path, monkeypatch):
+        """whisper is reported missing only when the transcript mode needs it."""
+        import youtube_checks
+
+        monkeypatch.setenv("PATH", str(tmp_path))
+        monkeypatch.setattr(youtube_checks, "_found_executables", {})
+
+        monkeypatch.delenv("YOUTUBE_TRANSCRIPT_MODE", raising=False)
+        assert youtube_checks.missing_dependencies() == ["yt-dlp not found", "ffmpeg not found"]
+
+        monkeypatch.setenv("YOUTUBE_TRANSCRIPT_MODE", "whisper")
+        assert youtube_checks.missing_dependencies()[-1] == "whisper not found (required for whisper mode)"
@@ -6,6 +6,7 @@ Run via Claude Code or cron.
 
 import os
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -58,6 +59,19 @@ FAILURE_ALERT_THRESHOLD = 3
 VAULT_PATH = Path.home() / "SecondBrain"
 LAST_TS_FILE = VAULT_PATH / "_scripts/.last_processed_ts"
 
+# Newest message ts handled this run; persisted once by _flush_last_ts()
+_pending_last_ts = None
+
+# Folders already created/confirmed by this process
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path: Path):
+    """mkdir -p, skipped for folders already ensured this process."""
+    if path not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
 
 def fetch_new_messages():
     """Get messages since last processed timestamp."""
@@ -65,6 +79,19 @@ def fetch_new_messages():
     return fetch_messages(oldest=last_ts)
 
 
+def _flush_last_ts():
+    """Atomically persist the newest processed ts, if any, to LAST_TS_FILE."""
+    global _pending_last_ts
+    if _pending_last_ts is None:
+        return
+
+    _ensure_dir(LAST_TS_FILE.parent)
+    temp_path = LAST_TS_FILE.with_name(LAST_TS_FILE.name + ".tmp")
+    temp_path.write_text(_pending_last_ts)
+    os.replace(temp_path, LAST_TS_FILE)
+    _pending_last_ts = None
+
+
 # --- Classification (called by Claude Code) ---
 
 CLASSIFICATION_PROMPT = """
@@ -178,6 +205,105 @@ def classify_thought(thought: str) -> dict:
 
 # --- Obsidian Writing ---
 
+# Frontmatter templates per destination; list fields are pre-rendered
+# as "  - item" lines by _yaml_list
+_PEOPLE_TMPL = (
+    "type: person\n"
+    "name: {name}\n"
+    "aliases:\n{aliases}"
+    "context: {context}\n"
+    "follow_ups:\n{follow_ups}"
+    "last_touched: {date}\n"
+    "tags:\n"
+)
+_PROJECT_TMPL = (
+    "type: project\n"
+    "name: {name}\n"
+    "status: {status}\n"
+    "next_action: {next_action}\n"
+    "tags:\n"
+    "created: {date}\n"
+)
+_IDEA_TMPL = (
+    "type: idea\n"
+    "title: {title}\n"
+    "oneliner: {oneliner}\n"
+    "tags:\n"
+    "created: {date}\n"
+)
+_ADMIN_TMPL = (
+    "type: admin\n"
+    "task: {task}\n"
+    "due_date: {due_date}\n"
+    "status: pending\n"
+    "created: {date}\n"
+)
+
+
+def _yaml_list(items) -> str:
+    return "".join(f"  - {item}\n" for item in items)
+
+
+def _fm_people(extracted: dict, date: str) -> tuple:
+    return _PEOPLE_TMPL.format(
+        name=extracted.get("name", ""),
+        aliases=_yaml_list(extracted.get("aliases", [])),
+        context=extracted.get("context", ""),
+        follow_ups=_yaml_list(extracted.get("follow_ups", [])),
+        date=date,
+    ), ""
+
+
+def _fm_project(extracted: dict, date: str) -> tuple:
+    return _PROJECT_TMPL.format(
+        name=extracted.get("name", ""),
+        status=extracted.get("status", "active"),
+        next_action=extracted.get("next_action", ""),
+        date=date,
+    ), extracted.get("notes", "")
+
+
+def _fm_idea(extracted: dict, date: str) -> tuple:
+    return _IDEA_TMPL.format(
+        title=extracted.get("title", ""),
+        oneliner=extracted.get("oneliner", ""),
+        date=date,
+    ), ""
+
+
+def _fm_admin(extracted: dict, date: str) -> tuple:
+    return _ADMIN_TMPL.format(
+        task=extracted.get("task", ""),
+        due_date=extracted.get("due_date", ""),
+        date=date,
+    ), ""
+
+
+# (frontmatter text, body) builders keyed by destination folder
+_FRONTMATTER_BUILDERS = {
+    "people": _fm_people,
+    "projects": _fm_project,
+    "ideas": _fm_idea,
+    "admin": _fm_admin,
+}
+
+
+def _write_file(path: Path, data: bytes, exclusive: bool = False):
+    """
+    Write bytes straight to a file descriptor, skipping buffered text IO.
+
+    With exclusive=True, raises FileExistsError instead of overwriting.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def write_to_obsidian(classification: dict, original_text: str, timestamp: str):
     """Write classified item to appropriate Obsidian folder."""
     dest = classification["destination"]
@@ -187,152 +313,148 @@ def write_to_obsidian(classification: dict, original_text: str, timestamp: str):
     linked_entities = classification.get("linked_entities", [])
 
     folder = VAULT_PATH / dest
-    folder.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(folder)
 
     # Process linked entities (creates stubs for new ones)
     entity_links = process_linked_entities(linked_entities, create_stubs=True)
 
-    # Build frontmatter based on type
-    if dest == "people":
-        frontmatter = {
-            "type": "person",
-            "name": extracted.get("name", ""),
-            "aliases": extracted.get("aliases", []),
-            "context": extracted.get("context", ""),
-            "follow_ups": extracted.get("follow_ups", []),
-            "last_touched": timestamp[:10],
-            "tags": []
-        }
-        body = ""
-    elif dest == "projects":
-        frontmatter = {
-            "type": "project",
-            "name": extracted.get("name", ""),
-            "status": extracted.get("status", "active"),
-            "next_action": extracted.get("next_action", ""),
-            "tags": [],
-            "created": timestamp[:10]
-        }
-        body = extracted.get("notes", "")
-    elif dest == "ideas":
-        frontmatter = {
-            "type": "idea",
-            "title": extracted.get("title", ""),
-            "oneliner": extracted.get("oneliner", ""),
-            "tags": [],
-            "created": timestamp[:10]
-        }
-        body = ""
-    else:  # admin
-        frontmatter = {
-            "type": "admin",
-            "task": extracted.get("task", ""),
-            "due_date": extracted.get("due_date", ""),
-            "status": "pending",
-            "created": timestamp[:10]
-        }
-        body = ""
-
-    # Write file
-    filepath = folder / filename
+    # Build frontmatter based on type (anything unrecognised files as admin)
+    build = _FRONTMATTER_BUILDERS.get(dest, _fm_admin)
+    frontmatter, body = build(extracted, timestamp[:10])
 
-    # Handle existing files (append timestamp if exists)
-    if filepath.exists():
-        base = filepath.stem
-        filepath = folder / f"{base}-{timestamp[:10]}.md"
-
-    content = "---\n"
-    for k, v in frontmatter.items():
-        if isinstance(v, list):
-            content += f"{k}:\n"
-            for item in v:
-                content += f"  - {item}\n"
-        else:
-            content += f"{k}: {v}\n"
-    content += "---\n\n"
+    parts = ["---\n", frontmatter, "---\n\n"]
 
     if body:
         # Insert wikilinks into body text
         linked_body = insert_wikilinks(body, entity_links)
-        content += f"{linked_body}\n\n"
+        parts.append(f"{linked_body}\n\n")
 
     # Insert wikilinks into original capture
     linked_original = insert_wikilinks(original_text, entity_links)
-    content += f"## Original Capture\n\n> {linked_original}\n"
+    parts.append(f"## Original Capture\n\n> {linked_original}\n")
 
-    filepath.write_text(content)
+    data = "".join(parts).encode("utf-8")
+
+    # Write file; O_EXCL detects an existing note without a separate stat
+    filepath = folder / filename
+    try:
+        _write_file(filepath, data, exclusive=True)
+    except FileExistsError:
+        # Handle existing files (append date)
+        filepath = folder / f"{filepath.stem}-{timestamp[:10]}.md"
+        _write_file(filepath, data)
     return filepath
 
 
-def log_to_inbox_log(original: str, destination: str, filename: str, confidence: float):
-    """Append to daily inbox log."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    log_file = VAULT_PATH / "_inbox_log" / f"{today}.md"
-    log_file.parent.mkdir(parents=True, exist_ok=True)
+# Lines queued for append during a run, keyed by path: [header_if_new, line, ...].
+# process_all pins one run_date, so a run crossing midnight stays in the day it started.
+_pending_appends = {}
 
-    if not log_file.exists():
-        log_file.write_text(
-            f"## Inbox Processing Log - {today}\n\n"
-            "| Time | Original | Destination | Filed As | Confidence |\n"
-            "|------|----------|-------------|----------|------------|\n"
-        )
 
-    time_now = datetime.now().strftime("%H:%M")
-    status = "**NEEDS REVIEW**" if confidence < 0.6 else destination
+def _append_line(path: Path, header: str, line: str):
+    """Queue a line for path; header is written first if the file is new."""
+    rows = _pending_appends.get(path)
+    if rows is None:
+        rows = [] if path.exists() else [header]
+        _pending_appends[path] = rows
+    rows.append(line)
 
-    with open(log_file, "a") as f:
-        f.write(
-            f"| {time_now} | {original[:40]}... | {status} | {filename} | {confidence:.2f} |\n"
-        )
 
+def _flush_appends():
+    """Write each queued file's lines with a single append."""
+    for path, rows in _pending_appends.items():
+        _ensure_dir(path.parent)
+        with open(path, "a") as f:
+            f.write("".join(rows))
+    _pending_appends.clear()
 
-def append_to_daily_note(destination: str, filename: str, summary: str):
+
+def log_to_inbox_log(
+    original: str,
+    destination: str,
+    filename: str,
+    confidence: float,
+    today: str = None,
+    time_now: str = None,
+):
+    """
+    Append to daily inbox log.
+
+    today (YYYY-MM-DD) and time_now (HH:MM) default to the current clock.
+    """
+    if today is None or time_now is None:
+        now = datetime.now()
+        today = today or now.strftime("%Y-%m-%d")
+        time_now = time_now or now.strftime("%H:%M")
+    log_file = VAULT_PATH / "_inbox_log" / f"{today}.md"
+
+    status = "**NEEDS REVIEW**" if confidence < 0.6 else destination
+
+    _append_line(
+        log_file,
+        f"## Inbox Processing Log - {today}\n\n"
+        "| Time | Original | Destination | Filed As | Confidence |\n"
+        "|------|----------|-------------|----------|------------|\n",
+        f"| {time_now} | {original[:40]}... | {status} | {filename} | {confidence:.2f} |\n",
+    )
+
+
+def append_to_daily_note(
+    destination: str,
+    filename: str,
+    summary: str,
+    today: str = None,
+    time_now: str = None,
+):
     """
     Append a capture entry to today's daily note.
 
     Creates the daily note if it doesn't exist, using Obsidian's
-    standard daily note format.
+    standard daily note format. today/time_now default to the current clock.
     """
-    today = datetime.now().strftime("%Y-%m-%d")
-    daily_folder = VAULT_PATH / "daily"
-    daily_folder.mkdir(parents=True, exist_ok=True)
-
-    daily_note = daily_folder / f"{today}.md"
-    time_now = datetime.now().strftime("%H:%M")
+    if today is None or time_now is None:
+        now = datetime.now()
+        today = today or now.strftime("%Y-%m-%d")
+        time_now = time_now or now.strftime("%H:%M")
+    daily_note = VAULT_PATH / "daily" / f"{today}.md"
 
     # Remove .md extension for wikilink
     link_name = filename.replace(".md", "")
 
-    if not daily_note.exists():
-        # Create daily note with header
-        daily_note.write_text(
-            f"---\n"
-            f"type: daily\n"
-            f"date: {today}\n"
-            f"---\n\n"
-            f"# {today}\n\n"
-            f"## Captured\n\n"
-        )
-
     # Append the capture entry with wikilink
-    with open(daily_note, "a") as f:
-        f.write(f"- {time_now} - [[{link_name}]] ({destination}): {summary[:60]}\n")
+    _append_line(
+        daily_note,
+        f"---\n"
+        f"type: daily\n"
+        f"date: {today}\n"
+        f"---\n\n"
+        f"# {today}\n\n"
+        f"## Captured\n\n",
+        f"- {time_now} - [[{link_name}]] ({destination}): {summary[:60]}\n",
+    )
 
 
 # --- Main Loop ---
 
-def process_message(msg: dict) -> bool:
+def process_message(msg: dict, run_date: str = None) -> bool:
     """
     Process a single message.
 
+    run_date (YYYY-MM-DD) selects the day's inbox log and daily note;
+    process_all computes it once per run.
+
     Returns True if successful, False if failed (logged to dead letter).
     """
+    global _pending_last_ts
     text = msg["text"]
     ts = msg["ts"]
-    timestamp = datetime.fromtimestamp(float(ts)).isoformat()
+    # Local wall-clock time of the message; write_to_obsidian uses the date
+    # part, the inbox log and daily note the HH:MM
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(float(ts)))
+    capture_time = timestamp[11:16]
 
     # Skip fix: commands - handled by fix_handler.py
-    if text.lower().startswith("fix:"):
+    if text[:4].lower() == "fix:":
         return True  # Not a failure, just skipped
 
     # Handle trigger commands for summaries and health checks
@@ -350,8 +472,8 @@ def process_message(msg: dict) -> bool:
                 response = generate_digest(projects, people, stalled)
             elif trigger == "review":
                 from weekly_review import gather_week_data, generate_review
-                inbox_logs, projects, stats = gather_week_data()
-                response = generate_review(inbox_logs, projects, stats)
+                projects, stats = gather_week_data()
+                response = generate_review(projects, stats)
             elif trigger == "health":
                 from health_check import check_health
                 is_healthy, issues = check_health(max_age_minutes=60, alert=False)
@@ -362,8 +484,7 @@ def process_message(msg: dict) -> bool:
 
             reply_to_message(ts, response)
             mark_message_processed(ts)
-            LAST_TS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            LAST_TS_FILE.write_text(ts)
+            _pending_last_ts = ts
             return True
         except Exception as e:
             import traceback
@@ -392,11 +513,11 @@ def process_message(msg: dict) -> bool:
         if conf >= 0.6:
             # File it
             filepath = write_to_obsidian(classification, text, timestamp)
-            log_to_inbox_log(text, dest, filepath.name, conf)
+            log_to_inbox_log(text, dest, filepath.name, conf, run_date, capture_time)
 
             # Append to daily note for Obsidian integration
             summary = text[:60] if len(text) <= 60 else text[:57] + "..."
-            append_to_daily_note(dest, filepath.name, summary)
+            append_to_daily_note(dest, filepath.name, summary, run_date, capture_time)
 
             # Record message-to-file mapping for fix commands
             set_file_for_message(ts, filepath)
@@ -409,7 +530,7 @@ def process_message(msg: dict) -> bool:
             )
         else:
             # Low confidence - log but don't file
-            log_to_inbox_log(text, "NEEDS REVIEW", "—", conf)
+            log_to_inbox_log(text, "NEEDS REVIEW", "—", conf, run_date, capture_time)
 
             reply_to_message(
                 ts,
@@ -421,9 +542,8 @@ def process_message(msg: dict) -> bool:
         # Mark message as processed (prevents duplicate processing)
         mark_message_processed(ts)
 
-        # Update last processed timestamp
-        LAST_TS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        LAST_TS_FILE.write_text(ts)
+        # Update last processed timestamp (written once per run by process_all)
+        _pending_last_ts = ts
 
         return True
 
@@ -449,11 +569,19 @@ def process_all():
         processed_count = 0
         failed_count = 0
 
-        for msg in reversed(messages):  # Process oldest first
-            if process_message(msg):
-                processed_count += 1
-            else:
-                failed_count += 1
+        # One inbox log / daily note per run, even across midnight
+        run_date = datetime.now().strftime("%Y-%m-%d")
+
+        try:
+            for msg in reversed(messages):  # Process oldest first
+                if process_message(msg, run_date):
+                    processed_count += 1
+                else:
+                    failed_count += 1
+        finally:
+            # One write per log/daily note, even if the loop is interrupted
+            _flush_appends()
+            _flush_last_ts()
 
         # Periodically clean up old processed message entries
         cleanup_old_processed_messages()